@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import codecs
 import json
 import logging
 import secrets
@@ -13,6 +14,7 @@ from collections.abc import Callable
 from typing import Any, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..utils.blender_helpers import get_addon_prefs, get_api_keys
 from ..utils.spec_validation import validate_scene_spec
@@ -112,6 +114,10 @@ class CircuitBreaker:
         """Timeouts are considered transient and do not trip the circuit."""
         pass
 
+# Connections kept per host by the shared session (covers concurrent probe workers)
+_HTTP_POOL_SIZE = 16
+
+
 class LLMInterface:
     """Handles API calls to OpenAI ChatGPT in a resilient manner."""
 
@@ -130,9 +136,16 @@ class LLMInterface:
 
         # Reliability primitives
         self._openai_circuit = CircuitBreaker(failure_threshold=3, reset_timeout_sec=30.0)
+
+        # Pooled HTTP session: keeps TCP+TLS connections alive across calls and threads.
+        # Retries stay in _retry_with_backoff_jitter so the circuit breaker sees every failure.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         
-        # Last raw response for debugging
-        self._last_raw = ""
+        # Last raw response for debugging, per calling thread (callers may share one instance)
+        self._raw_local = threading.local()
         
         # Apply optional provider configuration overrides from preferences
         self._load_preferences()
@@ -214,8 +227,9 @@ class LLMInterface:
     def _http_post(self, url: str, headers: dict[str, str], payload: dict[str, Any], timeout: float) -> requests.Response:
         """Execute HTTP POST with timeout."""
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-            self._last_raw = response.text
+            response = self._session.post(url, json=payload, headers=headers, timeout=timeout)
+            # Keep the undecoded body; get_last_raw decodes only what the caller asks for
+            self._raw_local.body = (response.content, response.encoding or "utf-8")
             return response
         except requests.Timeout as e:
             raise ProviderTimeoutError(f"Request timed out after {timeout}s") from e
@@ -301,8 +315,9 @@ class LLMInterface:
         request_id: str | None = None,
         temperature: float | None = None,
         max_tokens: int | None = None,
+        timeout_sec: float | None = None,
     ) -> dict[str, Any]:
-        """Get scene specification JSON from OpenAI ChatGPT."""
+        """Get scene specification JSON from OpenAI ChatGPT (timeout_sec overrides the HTTP timeout for this call)."""
         req = request_id or "req-unknown"
 
         if not self.openai_key:
@@ -341,7 +356,7 @@ class LLMInterface:
             }
             
             try:
-                resp = self._http_post(self.openai_endpoint, headers=headers, payload=payload, timeout=self.timeout_sec)
+                resp = self._http_post(self.openai_endpoint, headers=headers, payload=payload, timeout=timeout_sec or self.timeout_sec)
             except Exception as exc:
                 raise ProviderError(f"[{req}] Network error when calling OpenAI: {exc}") from exc
 
@@ -747,9 +762,22 @@ class LLMInterface:
 
         return ideas
 
-    def get_last_raw(self) -> str:
-        """Return last raw response for debugging."""
-        return self._last_raw
+    def get_last_raw(self, max_chars: int | None = None) -> str:
+        """
+        Return the last raw response received on the calling thread, for debugging.
+        With max_chars, only a bounded prefix of the body is decoded (at most 4 bytes per char).
+        """
+        content, encoding = getattr(self._raw_local, "body", (b"", "utf-8"))
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            # Unknown charset from the server: fall back to utf-8 like response.text does
+            encoding = "utf-8"
+        if max_chars is None:
+            return content.decode(encoding, errors="replace")
+        # Non-final incremental decode drops a multi-byte sequence cut by the slice
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        return decoder.decode(content[: max_chars * 4], final=False)[:max_chars]
 
 
 def register() -> None:
@@ -5,7 +5,7 @@ import random
 import time
 
 from ..utils.cleanup import cleanup_new_datablocks, snapshot_datablocks
-from ..utils.validation import CodeValidationError, make_restricted_globals, validate_scene_code
+from ..utils.validation import CodeValidationError, make_restricted_globals, validate_and_compile
 
 try:
     import bpy
@@ -51,34 +51,27 @@ class SceneBuilder:
         if not isinstance(code, str) or not code.strip():
             raise SceneExecutionError("Empty code string")
 
-        # Validate code safety using centralized validators (AST + allowlist)
+        # Validate code safety using centralized validators (AST + allowlist), then compile the
+        # validated tree with a request-id annotated filename for clearer error context
         try:
-            validate_scene_code(code)
+            compiled = validate_and_compile(code, f"<canvas3d_scene:{req_id}>")
         except CodeValidationError as e:
             raise SceneExecutionError(f"[{req_id}] Validation failed: {e}") from e
+        except Exception as e:
+            if bpy is None and dry_run_when_no_bpy:
+                raise SceneExecutionError(f"[{req_id}] Compilation failed outside Blender: {e}") from e
+            logger.error(f"[{req_id}] Code compilation failed: {e}")
+            raise SceneExecutionError(f"[{req_id}] Compilation failed: {e}") from e
 
         # Degrade gracefully when bpy is unavailable (e.g., CI, headless unit tests)
         if bpy is None:
             if dry_run_when_no_bpy:
-                try:
-                    # Compile only, using request-scoped filename for clear tracebacks
-                    compile(code, f"<canvas3d_scene:{req_id}>", "exec", dont_inherit=True, optimize=2)
-                except Exception as e:
-                    raise SceneExecutionError(f"[{req_id}] Compilation failed outside Blender: {e}") from e
-                finally:
-                    dur = time.perf_counter() - start_ts
-                    logger.info(f"[{req_id}] Dry-run validation complete in {dur:.3f}s (bpy unavailable)")
+                dur = time.perf_counter() - start_ts
+                logger.info(f"[{req_id}] Dry-run validation complete in {dur:.3f}s (bpy unavailable)")
                 return
             else:
                 raise SceneExecutionError(f"[{req_id}] bpy module not available. Run inside Blender.")
 
-        # Compile with request-id annotated filename for clearer error context
-        try:
-            compiled = compile(code, f"<canvas3d_scene:{req_id}>", "exec", dont_inherit=True, optimize=2)
-        except Exception as e:
-            logger.error(f"[{req_id}] Code compilation failed: {e}")
-            raise SceneExecutionError(f"[{req_id}] Compilation failed: {e}") from e
-
         # Snapshot existing datablocks for targeted cleanup on failure
         pre = snapshot_datablocks(bpy)
 
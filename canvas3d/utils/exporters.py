@@ -7,18 +7,22 @@
 #   render meshes and applying simple modifiers suitable for game engines.
 #
 # Limitations (MVP):
-# - Collision generation uses Decimate + Triangulate as a light heuristic.
+# - Collision generation uses Triangulate + Decimate as a light heuristic; Decimate targets a
+#   fixed triangle budget per object (default 8000) rather than a global ratio.
 # - If a collection name is not found, functions raise RuntimeError.
 # - USD export requires Blender with USD support.
 #
 # Public API:
-# - export_collection_gltf(collection_name: str, filepath: str, generate_collisions: bool = False) -> None
+# - export_collection_gltf(collection_name: str, filepath: str, generate_collisions: bool = False,
+#                          keep_original_images: bool = True) -> None
 # - export_collection_fbx(collection_name: str, filepath: str, generate_collisions: bool = False) -> None
 # - export_collection_usd(collection_name: str, filepath: str, generate_collisions: bool = False) -> None
 
 from __future__ import annotations
 
 import logging
+from array import array
+from typing import Any
 
 try:
     import bpy  # type: ignore
@@ -27,6 +31,18 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# Collision modifier recipes: (modifier name, modifier type, attributes to set).
+# Decimate ratio is filled in per object from the triangle budget.
+_COL_MODS: tuple[tuple[str, str, dict[str, object]], ...] = (
+    ("Triangulate", "TRIANGULATE", {"keep_custom_normals": True}),
+    ("Decimate", "DECIMATE", {"use_collapse_triangulate": True}),
+)
+
+# Default per-object triangle budget for collision meshes.
+COLLISION_TARGET_TRIANGLES = 8000
+# Meshes with fewer faces than this are already low-poly; Decimate is skipped.
+COLLISION_MIN_POLY_COUNT = 200
+
 def _get_collection(name: str) -> object:
     if bpy is None:
         raise RuntimeError("bpy not available; exporters require Blender runtime.")
@@ -47,37 +63,103 @@ def _ensure_collection(name: str) -> object:
         return col
     return data.collections.new(name)
 
+def _link_collection_to_scene(col: object) -> bool:
+    """Link col under the scene collection; True if it was linked here (caller unlinks it)."""
+    try:
+        scene_col = bpy.context.scene.collection
+        if scene_col.children.get(col.name) is None:
+            scene_col.children.link(col)
+            return True
+    except Exception as ex:
+        logger.debug("link collection to scene failed: %s", ex)
+    return False
+
+def _unlink_collection_from_scene(col: object) -> None:
+    try:
+        bpy.context.scene.collection.children.unlink(col)
+    except Exception as ex:
+        logger.debug("unlink collection from scene failed: %s", ex)
+
 def _link_object_to_collection(obj: object, col: object) -> None:
     try:
-        if hasattr(col, "objects") and hasattr(col.objects, "link"):
-            col.objects.link(obj)
+        col.objects.link(obj)
     except Exception as ex:
         logger.debug("link object to collection failed: %s", ex)
 
 def _duplicate_object(obj: object) -> object | None:
-    data = getattr(bpy, "data", None)
-    if data is None:
-        return None
     try:
         dup = obj.copy()
-        if getattr(obj, "data", None) is not None:
-            dup.data = obj.data.copy()
+        mesh = obj.data
+        if mesh is not None:
+            dup.data = mesh.copy()
         return dup
     except Exception as ex:
         logger.debug("duplicate object failed: %s", ex)
         return None
 
-def _is_mesh_object(obj: object) -> bool:
+def _apply_modifiers_inplace(obj: object, depsgraph: object) -> None:
+    """Bake the evaluated modifier stack into a new mesh and drop the modifiers."""
+    try:
+        if not obj.modifiers:
+            return
+        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+        old = getattr(obj, "data", None)
+        obj.modifiers.clear()
+        obj.data = mesh
+        # The pre-bake copy from _duplicate_object has no other users; don't leave it orphaned
+        if old is not None and old.users == 0:
+            bpy.data.meshes.remove(old)
+    except Exception as ex:
+        logger.debug("apply modifiers failed: %s", ex)
+
+def _mesh_stats(mesh: object) -> tuple[int, int, bool]:
+    """Return (face count, triangle count after triangulation, already fully triangulated)."""
     try:
-        return getattr(obj, "type", "") == "MESH"
+        polygons = mesh.polygons
+        polys = len(polygons)
+        # Bulk-read per-face corner counts instead of iterating polygons in Python
+        loop_totals = array("i", [0]) * polys
+        polygons.foreach_get("loop_total", loop_totals)
     except Exception as ex:
-        logger.debug("is_mesh_object check failed: %s", ex)
-        return False
+        logger.debug("mesh stats failed: %s", ex)
+        return 0, 0, False
+    tris = sum(loop_totals) - 2 * polys
+    # Every face has at least 3 corners, so the mesh is all triangles iff tris == polys
+    return polys, tris, tris == polys
 
-def generate_collision_meshes(collection_name: str) -> str:
+def _collision_mods(
+    mesh: object, target_triangles: int, min_poly_count: int = COLLISION_MIN_POLY_COUNT
+) -> list[tuple[str, str, dict[str, object]]]:
+    """
+    Select the collision modifiers needed for a mesh: Triangulate only when the mesh has
+    non-triangle faces, Decimate only when it is not already low-poly and exceeds the
+    triangle budget.
+    """
+    polys, tris, triangulated = _mesh_stats(mesh)
+    mods: list[tuple[str, str, dict[str, object]]] = []
+    for mod_name, mod_type, attrs in _COL_MODS:
+        if mod_type == "TRIANGULATE":
+            if triangulated:
+                continue
+        elif mod_type == "DECIMATE":
+            if polys < min_poly_count or tris <= target_triangles:
+                continue
+            attrs = {**attrs, "ratio": target_triangles / tris}
+        mods.append((mod_name, mod_type, attrs))
+    return mods
+
+def generate_collision_meshes(
+    collection_name: str,
+    target_triangles: int = COLLISION_TARGET_TRIANGLES,
+    min_poly_count: int = COLLISION_MIN_POLY_COUNT,
+) -> str:
     """
     Duplicate all mesh objects in the given collection into a sibling collision collection
-    and apply simple modifiers (Triangulate + Decimate). Returns the collision collection name.
+    and apply simple modifiers (Triangulate + Decimate). Decimate ratio is chosen per object
+    as target_triangles / current triangles; meshes already within budget, or with fewer than
+    min_poly_count faces, are not decimated.
+    Modifiers are baked into the collision meshes once here, so exporting them does not
+    evaluate Triangulate/Decimate again. Returns the collision collection name.
     """
     if bpy is None:
         raise RuntimeError("bpy unavailable")
@@ -85,49 +167,74 @@ def generate_collision_meshes(collection_name: str) -> str:
     coll_name = f"{collection_name}_Collision"
     dst_col = _ensure_collection(coll_name)
 
+    # Bind hot-loop callables to locals (avoids repeated global/attribute lookups)
+    remove_object = bpy.data.objects.remove
+    duplicate = _duplicate_object
+    link = _link_object_to_collection
+    collision_mods = _collision_mods
+
     # Optionally clear existing content
     try:
         # Remove existing objects in collision collection
         for o in list(getattr(dst_col, "objects", [])):
             try:
-                bpy.data.objects.remove(o, do_unlink=True)
+                remove_object(o, do_unlink=True)
             except TypeError:
-                bpy.data.objects.remove(o)
+                remove_object(o)
     except Exception as ex:
         logger.debug("clear collision collection failed: %s", ex)
 
     # Duplicate mesh objects
+    duplicates: list[Any] = []
+    add_duplicate = duplicates.append
     for obj in list(getattr(src_col, "objects", [])):
-        if not _is_mesh_object(obj):
+        try:
+            if obj.type != "MESH":
+                continue
+        except AttributeError:
             continue
-        dup = _duplicate_object(obj)
+        dup = duplicate(obj)
         if dup is None:
             continue
         dup.name = f"{obj.name}_COL"
 
         # Place into collision collection
-        _link_object_to_collection(dup, dst_col)
+        link(dup, dst_col)
+        add_duplicate(dup)
 
         # Apply lightweight collision-friendly modifiers
         try:
-            # Triangulate
-            tri = dup.modifiers.new(name="Triangulate", type="TRIANGULATE")
-            tri.keep_custom_normals = True
-        except Exception as ex:
-            logger.debug("triangulate modifier failed: %s", ex)
-        try:
-            # Decimate (collapse) to reduce complexity; ratio conservative
-            dec = dup.modifiers.new(name="Decimate", type="DECIMATE")
-            dec.ratio = 0.5
-            dec.use_collapse_triangulate = True
+            mods = collision_mods(obj.data, target_triangles, min_poly_count)
+            for mod_name, mod_type, attrs in mods:
+                mod = dup.modifiers.new(name=mod_name, type=mod_type)
+                for key, value in attrs.items():
+                    setattr(mod, key, value)
         except Exception as ex:
-            logger.debug("decimate modifier failed: %s", ex)
+            logger.debug("collision modifiers failed for %s: %s", dup.name, ex)
+
+    if not duplicates:
+        return coll_name
 
-        # Disable rendering flags (optional)
+    # Disable rendering flags (optional); one failure must not leave later duplicates renderable
+    for dup in duplicates:
         try:
             dup.hide_render = True
         except Exception as ex:
-            logger.debug("hide_render flag set failed: %s", ex)
+            logger.debug("hide_render flag set failed for %s: %s", dup.name, ex)
+
+    # Bake collision modifiers once. The depsgraph only evaluates objects in the view layer, so
+    # the collection is linked into the scene for the bake and unlinked again afterwards.
+    linked = _link_collection_to_scene(dst_col)
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    except Exception as ex:
+        logger.debug("depsgraph unavailable; collision modifiers left live: %s", ex)
+    else:
+        for dup in duplicates:
+            _apply_modifiers_inplace(dup, depsgraph)
+    finally:
+        if linked:
+            _unlink_collection_from_scene(dst_col)
 
     return coll_name
 
@@ -157,7 +264,17 @@ def _select_collection_objects(col: object) -> None:
     except Exception as ex:
         logger.debug("set active object failed: %s", ex)
 
-def export_collection_gltf(collection_name: str, filepath: str, generate_collisions: bool = False) -> None:
+def export_collection_gltf(
+    collection_name: str,
+    filepath: str,
+    generate_collisions: bool = False,
+    keep_original_images: bool = True,
+) -> None:
+    """
+    Export a collection as GLB. With keep_original_images, textures are taken from their
+    source files instead of being re-encoded (Blender 3.2+); PBR textures bound by
+    material_library are disk-backed and qualify. Older exporters ignore the option.
+    """
     if bpy is None:
         raise RuntimeError("bpy unavailable")
     col = _get_collection(collection_name)
@@ -169,18 +286,27 @@ def export_collection_gltf(collection_name: str, filepath: str, generate_collisi
             logger.debug("generate_collision_meshes failed (glTF): %s", ex)
     _select_collection_objects(col)
     # Export active selection as glTF (embedded by default)
+    kwargs: dict[str, object] = {
+        "filepath": filepath,
+        "export_format": 'GLB',  # single file binary
+        "use_selection": True,
+        "export_apply": True,
+        "export_texcoords": True,
+        "export_normals": True,
+        "export_tangents": False,
+        "export_materials": 'EXPORT',
+        "export_colors": True,
+    }
+    if keep_original_images:
+        kwargs["export_keep_originals"] = True
     try:
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            export_format='GLB',  # single file binary
-            use_selection=True,
-            export_apply=True,
-            export_texcoords=True,
-            export_normals=True,
-            export_tangents=False,
-            export_materials='EXPORT',
-            export_colors=True,
-        )
+        try:
+            bpy.ops.export_scene.gltf(**kwargs)
+        except TypeError:
+            # Exporter predates export_keep_originals (Blender < 3.2)
+            if kwargs.pop("export_keep_originals", None) is None:
+                raise
+            bpy.ops.export_scene.gltf(**kwargs)
     except Exception as ex:
         raise RuntimeError(f"glTF export failed: {ex}") from ex
 
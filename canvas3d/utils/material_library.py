@@ -17,6 +17,9 @@
 # API:
 # - ensure_pbr_material(name: str, pbr: dict | None) -> bpy.types.Material | None
 #   Creates or returns an existing material with node setup (textures if found).
+# - ensure_pbr_materials(specs: list[tuple[str, dict | None]]) -> dict[str, bpy.types.Material | None]
+#   Batch variant: texture directories are scanned concurrently on worker threads,
+#   node setup still runs serially on the calling (main) thread since bpy is not thread-safe.
 #
 # Notes:
 # - All bpy usage is guarded; the module can import without Blender.
@@ -25,8 +28,11 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 try:
@@ -39,41 +45,66 @@ from .blender_helpers import get_config_dir
 logger = logging.getLogger(__name__)
 
 _SUPPORTED_EXTS = (".png", ".jpg", ".jpeg")
+_TEX_BASENAMES = ("basecolor", "metallic", "roughness", "normal")
+_SCAN_WORKERS = 8
+# Custom property recording the inputs a material was last set up from
+_SIG_KEY = "_c3d_pbr_sig"
 
 def _material_dir(name: str) -> str:
     base = get_config_dir()
     return os.path.join(base, "materials", str(name))
 
-def _find_tex(path_dir: str, basename: str) -> str | None:
-    for ext in _SUPPORTED_EXTS:
-        fp = os.path.join(path_dir, basename + ext)
-        if os.path.isfile(fp):
-            return fp
-    return None
+def _scan_textures(name: str) -> dict[str, str] | None:
+    """
+    Map texture basenames to file paths with a single directory listing.
+    Returns None when the material directory does not exist. Names match case-insensitively;
+    when several extensions exist for one basename, the earliest in _SUPPORTED_EXTS wins.
+    """
+    found: dict[str, tuple[int, str]] = {}
+    try:
+        with os.scandir(_material_dir(name)) as entries:
+            for entry in entries:
+                # Case-insensitive like the filesystem lookups on Windows/macOS (BaseColor.PNG)
+                stem, ext = os.path.splitext(entry.name.lower())
+                if stem not in _TEX_BASENAMES or ext not in _SUPPORTED_EXTS:
+                    continue
+                if not entry.is_file():
+                    continue
+                rank = _SUPPORTED_EXTS.index(ext)
+                if stem not in found or rank < found[stem][0]:
+                    found[stem] = (rank, entry.path)
+    except OSError:
+        return None
+    return {stem: fp for stem, (_rank, fp) in found.items()}
 
 def _load_image(filepath: str) -> object | None:
     if bpy is None:
         return None
     try:
-        return bpy.data.images.load(filepath)
+        # check_existing reuses an already-loaded datablock for the same path instead of
+        # decoding the file again into a duplicate Image.
+        return bpy.data.images.load(filepath, check_existing=True)
     except Exception as ex:
         logger.debug("image load failed: %s", ex)
-        # Try to reuse if already loaded
-        try:
-            for img in getattr(getattr(bpy, "data", None), "images", []):
-                if getattr(img, "filepath", "") == filepath:
-                    return img
-        except Exception as ex:
-            logger.debug("scan images failed: %s", ex)
     return None
 
-def _get_or_create_material(name: str) -> object | None:
+def _material_snapshot() -> dict[str, object]:
+    """Name -> material map built with one scan of bpy.data.materials (batch lookups)."""
+    try:
+        return {m.name: m for m in bpy.data.materials}
+    except Exception as ex:
+        logger.debug("material snapshot failed: %s", ex)
+        return {}
+
+def _get_or_create_material(
+    name: str, snapshot: dict[str, object] | None = None
+) -> object | None:
     if bpy is None:
         return None
     data = getattr(bpy, "data", None)
     if data is None:
         return None
-    mat = data.materials.get(name)
+    mat = snapshot.get(name) if snapshot is not None else data.materials.get(name)
     if mat:
         # Ensure nodes enabled
         try:
@@ -84,6 +115,8 @@ def _get_or_create_material(name: str) -> object | None:
     try:
         mat = data.materials.new(name=name)
         mat.use_nodes = True
+        if snapshot is not None:
+            snapshot[name] = mat
         return mat
     except Exception as ex:
         logger.debug("create material failed: %s", ex)
@@ -162,54 +195,81 @@ def _create_tex_node(nt: object, image: object, label: str, loc: tuple[int, int]
         logger.debug("create texture node failed: %s", ex)
         return None
 
-def ensure_pbr_material(name: str, pbr: dict[str, Any] | None = None) -> object | None:
-    """
-    Ensure a material exists with Principled BSDF nodes and CC0 PBR textures if found.
-    Returns the material or None when bpy isn't available.
-    """
-    mat = _get_or_create_material(name)
+def _pbr_signature(
+    name: str, pbr: dict[str, Any] | None, textures: dict[str, str] | None
+) -> str:
+    # Stable across sessions (unlike hash()), so it survives save/reload of the .blend
+    payload = json.dumps([name, pbr or {}, textures], sort_keys=True, default=str)
+    return hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+
+def _link_nodes(nt: object, links: list[tuple[object, str, object, str]]) -> None:
+    for from_node, out_name, to_node, in_name in links:
+        try:
+            nt.links.new(from_node.outputs.get(out_name), to_node.inputs.get(in_name))
+        except Exception as ex:
+            logger.debug("link %s -> %s failed: %s", out_name, in_name, ex)
+
+def _set_signature(mat: object, sig: str) -> None:
+    try:
+        mat[_SIG_KEY] = sig
+    except Exception as ex:
+        logger.debug("write material signature failed: %s", ex)
+
+def _build_pbr_material(
+    name: str,
+    pbr: dict[str, Any] | None,
+    textures: dict[str, str] | None,
+    snapshot: dict[str, object] | None = None,
+) -> object | None:
+    mat = _get_or_create_material(name, snapshot)
     if mat is None or getattr(mat, "node_tree", None) is None:
         return mat
 
+    # Already set up from identical inputs: skip node walk, image loads and relinking
+    sig = _pbr_signature(name, pbr, textures)
+    try:
+        if mat.get(_SIG_KEY) == sig:
+            return mat
+    except Exception as ex:
+        logger.debug("read material signature failed: %s", ex)
+
     nt = mat.node_tree
     bsdf = _get_bsdf(mat)
     # Apply fallback values first
     _set_bsdf_fallback(bsdf, pbr)
 
     # Attempt texture binding
-    mdir = _material_dir(name)
-    if not os.path.isdir(mdir):
+    if textures is None:
+        _set_signature(mat, sig)
         return mat  # fallback only
 
-    base_fp = _find_tex(mdir, "basecolor")
-    met_fp = _find_tex(mdir, "metallic")
-    rough_fp = _find_tex(mdir, "roughness")
-    norm_fp = _find_tex(mdir, "normal")
+    base_fp = textures.get("basecolor")
+    met_fp = textures.get("metallic")
+    rough_fp = textures.get("roughness")
+    norm_fp = textures.get("normal")
 
     base_img = _load_image(base_fp) if base_fp else None
     met_img = _load_image(met_fp) if met_fp else None
     rough_img = _load_image(rough_fp) if rough_fp else None
     norm_img = _load_image(norm_fp) if norm_fp else None
 
-    # Create and link nodes
+    # Create all nodes first, then link in a single pass so the node tree is
+    # only re-tagged once per material instead of after every node creation.
+    # Socket names are kept (not positional indices): Principled BSDF input
+    # order changed between Blender 3.x and 4.x.
+    pending_links: list[tuple[object, str, object, str]] = []
     if base_img:
         tex_base = _create_tex_node(nt, base_img, "BaseColor", (-400, 0))
-        try:
-            nt.links.new(tex_base.outputs.get("Color"), bsdf.inputs.get("Base Color"))
-        except Exception as ex:
-            logger.debug("link base color texture failed: %s", ex)
+        if tex_base:
+            pending_links.append((tex_base, "Color", bsdf, "Base Color"))
     if met_img:
         tex_met = _create_tex_node(nt, met_img, "Metallic", (-400, -150))
-        try:
-            nt.links.new(tex_met.outputs.get("Color"), bsdf.inputs.get("Metallic"))
-        except Exception as ex:
-            logger.debug("link metallic texture failed: %s", ex)
+        if tex_met:
+            pending_links.append((tex_met, "Color", bsdf, "Metallic"))
     if rough_img:
         tex_rough = _create_tex_node(nt, rough_img, "Roughness", (-400, -300))
-        try:
-            nt.links.new(tex_rough.outputs.get("Color"), bsdf.inputs.get("Roughness"))
-        except Exception as ex:
-            logger.debug("link roughness texture failed: %s", ex)
+        if tex_rough:
+            pending_links.append((tex_rough, "Color", bsdf, "Roughness"))
     if norm_img:
         # Normal map requires a normal map node
         try:
@@ -217,11 +277,42 @@ def ensure_pbr_material(name: str, pbr: dict[str, Any] | None = None) -> object
             nmap.location = (-200, -450)
             tex_norm = _create_tex_node(nt, norm_img, "Normal", (-400, -450))
             if tex_norm and nmap:
-                nt.links.new(tex_norm.outputs.get("Color"), nmap.inputs.get("Color"))
-                nt.links.new(nmap.outputs.get("Normal"), bsdf.inputs.get("Normal"))
+                pending_links.append((tex_norm, "Color", nmap, "Color"))
+                pending_links.append((nmap, "Normal", bsdf, "Normal"))
         except Exception as ex:
-            logger.debug("link normal texture failed: %s", ex)
+            logger.debug("create normal map node failed: %s", ex)
 
+    _link_nodes(nt, pending_links)
+
+    _set_signature(mat, sig)
     return mat
 
-__all__ = ["ensure_pbr_material"]
\ No newline at end of file
+def ensure_pbr_material(name: str, pbr: dict[str, Any] | None = None) -> object | None:
+    """
+    Ensure a material exists with Principled BSDF nodes and CC0 PBR textures if found.
+    Returns the material or None when bpy isn't available.
+    """
+    if bpy is None:
+        return None
+    return _build_pbr_material(name, pbr, _scan_textures(name))
+
+def ensure_pbr_materials(
+    specs: list[tuple[str, dict[str, Any] | None]],
+) -> dict[str, object | None]:
+    """
+    Batch variant of ensure_pbr_material. Texture directories are scanned concurrently
+    (I/O-bound, releases the GIL); material and node creation then runs serially on the
+    calling thread, resolving existing materials from a single bpy.data.materials snapshot.
+    Returns a mapping of material name to material (or None).
+    """
+    if bpy is None:
+        return {name: None for name, _pbr in specs}
+    names = list(dict.fromkeys(name for name, _pbr in specs))
+    with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, max(1, len(names)))) as pool:
+        scans = dict(zip(names, pool.map(_scan_textures, names), strict=True))
+    snapshot = _material_snapshot()
+    return {
+        name: _build_pbr_material(name, pbr, scans[name], snapshot) for name, pbr in specs
+    }
+
+__all__ = ["ensure_pbr_material", "ensure_pbr_materials"]
\ No newline at end of file
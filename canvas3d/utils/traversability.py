@@ -13,7 +13,7 @@
 #
 # Notes:
 # - Coordinates are integer grid cells in [0..cols-1] x [0..rows-1]
-# - Movement is 4-connected (N,E,S,W)
+# - Movement is 4-connected (N,E,S,W); grids above _BIDIR_MIN_CELLS use bidirectional A*
 # - blocked is a set of (col,row) cells that cannot be traversed
 # - For MVP, spec extraction uses conservative defaults; will be enhanced to encode
 #   rooms, corridors, and doors semantics from the schema contract.
@@ -21,9 +21,20 @@
 from __future__ import annotations
 
 import heapq
+import threading
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+# Grids at or below this many cells use plain A*; bidirectional bookkeeping doesn't pay off.
+_BIDIR_MIN_CELLS = 64
+
+# format(bits, "b") digits -> mask bytes
+_BIT_CELLS = bytes.maketrans(b"01", b"\x00\x01")
+_CELL_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+# Per-thread A* score buffers, grown to the largest grid seen (see _score_buffers)
+_TLS = threading.local()
+
 
 @dataclass(frozen=True)
 class Cell:
@@ -38,16 +49,171 @@ def _in_bounds(c: int, r: int, cols: int, rows: int) -> bool:
     return 0 <= c < cols and 0 <= r < rows
 
 
-def _neighbors_4(c: int, r: int, cols: int, rows: int) -> Iterable[tuple[int, int]]:
-    # 4-connected grid
-    cand = ((c + 1, r), (c - 1, r), (c, r + 1), (c, r - 1))
-    for cc, rr in cand:
-        if _in_bounds(cc, rr, cols, rows):
-            yield (cc, rr)
+def _blocked_mask(cols: int, rows: int, blocked: Iterable[tuple[int, int]]) -> bytearray:
+    """
+    Flatten a set of (col,row) cells into a per-cell mask with a one-cell blocked border.
+    Cell (c,r) lives at (r+1)*(cols+2) + (c+1); the border doubles as the bounds check,
+    so neighbours are plain idx +/- 1 and idx +/- width offsets.
+    """
+    width = cols + 2
+    edge = b"\x01" * width
+    mask = bytearray(edge + (b"\x01" + bytes(cols) + b"\x01") * rows + edge)
+    for c, r in blocked:
+        if 0 <= c < cols and 0 <= r < rows:
+            mask[(r + 1) * width + c + 1] = 1
+    return mask
+
+
+def _mask_from_bits(cols: int, rows: int, bits: int) -> bytearray:
+    """
+    Expand a blocked-cell bitmap (bit r*cols + c set when blocked) into the padded
+    per-cell mask used by the A* kernels. The unpacking runs in C via format/translate.
+    """
+    if cols <= 0 or rows <= 0:
+        return bytearray()
+    size = cols * rows
+    cells = format(bits, f"0{size}b")[::-1].encode("ascii").translate(_BIT_CELLS)
+    width = cols + 2
+    edge = b"\x01" * width
+    body = b"\x01\x01".join(cells[i : i + cols] for i in range(0, size, cols))
+    return bytearray(edge + b"\x01" + body + b"\x01" + edge)
+
+
+def _score_buffers(size: int, count: int) -> tuple[list[list[int]], int]:
+    """
+    Return `count` per-thread g-score buffers of at least `size` cells plus a fresh base.
+    Each search stores base + g and the base drops by size + 2 per search, so every value
+    left by an earlier search (or the initial 0) reads as larger than any score of the
+    current one, i.e. unvisited. Buffers are reused without a per-call reset.
+    """
+    bufs = getattr(_TLS, "score_bufs", None)
+    if bufs is None:
+        bufs = _TLS.score_bufs = []
+        _TLS.score_base = 0
+    while len(bufs) < count:
+        bufs.append([])
+    for buf in bufs[:count]:
+        if len(buf) < size:
+            buf.extend([0] * (size - len(buf)))
+    base = _TLS.score_base - (size + 2)
+    _TLS.score_base = base
+    return bufs[:count], base
+
+
+def _astar_grid(width: int, mask: bytearray, s: int, g: int) -> int | None:
+    """
+    A* over flat indices of a border-padded mask (see _blocked_mask) with a Manhattan
+    heuristic. g-scores live in a flat per-cell buffer so the hot loop never hashes tuples.
+    Heap entries are single ints (f << shift | idx): ordering by f, no tuple per push.
+    Instead of a closed set, popped entries whose f no longer equals g + h are skipped as stale
+    (lazy decrease-key); with a consistent heuristic each cell is expanded at most once.
+    g-scores are stored offset by base in a reused per-thread buffer (see _score_buffers).
+    """
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    size = len(mask)
+    (g_score,), base = _score_buffers(size, 1)
+    gr, gc = divmod(g, width)
+    steps = ((1, 1, 0), (-1, -1, 0), (width, 0, 1), (-width, 0, -1))
+    shift = size.bit_length()
+    idx_mask = (1 << shift) - 1
+
+    sr, sc = divmod(s, width)
+    g_score[s] = base
+    open_heap: list[int] = [((abs(sc - gc) + abs(sr - gr)) << shift) | s]
+    while open_heap:
+        key = heappop(open_heap)
+        cur = key & idx_mask
+        r, c = divmod(cur, width)
+        g_cur = g_score[cur]
+        if key >> shift != g_cur - base + abs(c - gc) + abs(r - gr):
+            continue  # stale entry: cur was re-pushed with a lower g
+        if cur == g:
+            return g_cur - base
+
+        tentative = g_cur + 1
+        for step, dc, dr in steps:
+            nb = cur + step
+            if mask[nb] or tentative >= g_score[nb]:
+                continue
+            g_score[nb] = tentative
+            f = tentative - base + abs(c + dc - gc) + abs(r + dr - gr)
+            heappush(open_heap, (f << shift) | nb)
+
+    return None
+
 
+def _bidir_astar(width: int, mask: bytearray, s: int, g: int) -> int | None:
+    """
+    Bidirectional A*: forward search from s and backward search from g, expanding the
+    smaller frontier each step. Any relaxed edge that touches a cell already reached by the
+    other side yields a candidate path length. The search stops once either frontier's
+    smallest f can no longer beat the best candidate (f is a lower bound on any path
+    through that frontier).
+    """
+    if s == g:
+        return 0
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    size = len(mask)
+    inf = size + 1
+    (g_f, g_b), base = _score_buffers(size, 2)
+    base2 = base + base
+    sr, sc = divmod(s, width)
+    gr, gc = divmod(g, width)
+    steps = ((1, 1, 0), (-1, -1, 0), (width, 0, 1), (-width, 0, -1))
+    shift = size.bit_length()
+    idx_mask = (1 << shift) - 1
+
+    g_f[s] = base
+    g_b[g] = base
+    h0 = abs(sc - gc) + abs(sr - gr)
+    open_f: list[int] = [(h0 << shift) | s]
+    open_b: list[int] = [(h0 << shift) | g]
+    best = inf
+    while open_f and open_b:
+        if open_f[0] >> shift >= best or open_b[0] >> shift >= best:
+            break
+        if len(open_f) <= len(open_b):
+            heap, g_this, g_other, tr, tc = open_f, g_f, g_b, gr, gc
+        else:
+            heap, g_this, g_other, tr, tc = open_b, g_b, g_f, sr, sc
+
+        key = heappop(heap)
+        cur = key & idx_mask
+        r, c = divmod(cur, width)
+        g_cur = g_this[cur]
+        if key >> shift != g_cur - base + abs(c - tc) + abs(r - tr):
+            continue  # stale entry
+
+        tentative = g_cur + 1
+        for step, dc, dr in steps:
+            nb = cur + step
+            if mask[nb]:
+                continue
+            through = tentative + g_other[nb] - base2  # unreached cells read as > inf
+            if through < best:
+                best = through
+            if tentative >= g_this[nb]:
+                continue
+            g_this[nb] = tentative
+            f = tentative - base + abs(c + dc - tc) + abs(r + dr - tr)
+            heappush(heap, (f << shift) | nb)
 
-def _manhattan(a: tuple[int, int], b: tuple[int, int]) -> int:
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+    return best if best < inf else None
+
+
+def _grid_path_length(
+    cols: int, rows: int, mask: bytearray, start: tuple[int, int], goal: tuple[int, int]
+) -> int | None:
+    """Run A* for in-bounds start/goal cells; None if either is blocked or no path exists."""
+    width = cols + 2
+    s_idx = (start[1] + 1) * width + start[0] + 1
+    g_idx = (goal[1] + 1) * width + goal[0] + 1
+    if mask[s_idx] or mask[g_idx]:
+        return None
+    search = _bidir_astar if cols * rows > _BIDIR_MIN_CELLS else _astar_grid
+    return search(width, mask, s_idx, g_idx)
 
 
 def astar_path_length(
@@ -65,33 +231,12 @@ def astar_path_length(
         return None
     if not _in_bounds(goal[0], goal[1], cols, rows):
         return None
+    if not blocked:
+        # Open grid: the shortest 4-connected path is exactly the Manhattan distance
+        return abs(start[0] - goal[0]) + abs(start[1] - goal[1])
     if start in blocked or goal in blocked:
         return None
-
-    open_heap: list[tuple[int, tuple[int, int]]] = []
-    heapq.heappush(open_heap, (0, start))
-    g_score: dict[tuple[int, int], int] = {start: 0}
-    closed: set[tuple[int, int]] = set()
-
-    while open_heap:
-        _, cur = heapq.heappop(open_heap)
-        if cur in closed:
-            continue
-        if cur == goal:
-            return g_score[cur]
-        closed.add(cur)
-
-        for nb in _neighbors_4(cur[0], cur[1], cols, rows):
-            if nb in blocked:
-                continue
-            tentative = g_score[cur] + 1
-            prev = g_score.get(nb)
-            if prev is None or tentative < prev:
-                g_score[nb] = tentative
-                f = tentative + _manhattan(nb, goal)
-                heapq.heappush(open_heap, (f, nb))
-
-    return None
+    return _grid_path_length(cols, rows, _blocked_mask(cols, rows, blocked), start, goal)
 
 
 def check_traversable(
@@ -105,7 +250,10 @@ def check_traversable(
     """
     Return (ok, path_len). ok is True if a path exists and satisfies min_len (if provided).
     """
-    length = astar_path_length(cols, rows, blocked, start, goal)
+    return _check_length(astar_path_length(cols, rows, blocked, start, goal), min_len)
+
+
+def _check_length(length: int | None, min_len: int | None) -> tuple[bool, int | None]:
     if length is None:
         return False, None
     if min_len is not None and length < int(min_len):
@@ -124,79 +272,130 @@ def _extract_grid_dims(spec: dict) -> tuple[int, int]:
     return cols, rows
 
 
-def _extract_blocked_from_spec(spec: dict) -> set[tuple[int, int]]:
+def _bits_from_indices(size: int, indices: Iterable[int]) -> int:
+    """Pack flat cell indices into a bitmap through a byte-per-cell buffer (no big-int shifts)."""
+    if size <= 0:
+        return 0
+    cells = bytearray(size)
+    for i in indices:
+        cells[i] = 1
+    return int(cells.translate(_CELL_BITS)[::-1], 2)
+
+
+def _rect_bits(cols: int, rows: int, min_col: int, max_col: int, min_row: int, max_row: int) -> int:
+    """
+    Bitmap of the half-open rectangle [min_col,max_col) x [min_row,max_row), clipped to the grid.
+    One row mask is replicated down the rows by multiplying with the base-2**cols repunit
+    (sum of 1 << k*cols), so the cost is a few big-int ops regardless of the area.
+    """
+    c0, c1 = max(0, min_col), min(cols, max_col)
+    r0, r1 = max(0, min_row), min(rows, max_row)
+    if c0 >= c1 or r0 >= r1:
+        return 0
+    row = ((1 << (c1 - c0)) - 1) << c0
+    repunit = ((1 << (cols * (r1 - r0))) - 1) // ((1 << cols) - 1)
+    return (row * repunit) << (r0 * cols)
+
+
+def _is_kind(value: object, kind: str) -> bool:
+    """Case-insensitive match of a spec 'type' string; canonical lowercase values skip .lower()."""
+    if value == kind:
+        return True
+    return isinstance(value, str) and not value.islower() and value.lower() == kind
+
+
+def _pair_index(cell: object, cols: int, rows: int) -> int:
+    """Flat index of a [col, row] pair inside the grid, or -1 when malformed/out of bounds."""
+    if not isinstance(cell, (list, tuple)) or len(cell) != 2:
+        return -1
+    try:
+        c, r = int(cell[0]), int(cell[1])
+    except (TypeError, ValueError, OverflowError):
+        return -1
+    if 0 <= c < cols and 0 <= r < rows:
+        return r * cols + c
+    return -1
+
+
+def _extract_blocked_from_spec(spec: dict) -> int:
     """
-    Derive blocked cells from the spec.
-    Defaults to an empty set unless objects explicitly mark blocking.
+    Derive blocked cells from the spec as a bitmap: bit r*cols + c is set when (c,r) is blocked.
+    Defaults to no blocked cells unless objects explicitly mark blocking.
     Enhancements:
     - Any object with properties.blocked == True will force-block its grid_cell.
     - Explicit 'traversable_cells' (on spec or per-object) are honored as open cells.
     - 'walkable_area' rectangles (per-object) are honored as open cells.
     - Doors are considered traversable (their cells are forced open).
+    Malformed entries are skipped individually via type checks rather than exceptions.
     """
     cols, rows = _extract_grid_dims(spec)
-    blocked: set[tuple[int, int]] = set()
-    forced_open: set[tuple[int, int]] = set()
+    block_idx: list[int] = []
+    open_idx: list[int] = []
+    add_blocked = block_idx.append
+    add_open = open_idx.append
+    rect_open = 0
 
     # Spec-level explicit traversable cells (optional)
-    try:
-        for cell in spec.get("traversable_cells", []) or []:
-            if isinstance(cell, (list, tuple)) and len(cell) == 2:
-                c, r = int(cell[0]), int(cell[1])
-                if 0 <= c < cols and 0 <= r < rows:
-                    forced_open.add((c, r))
-    except Exception:
-        pass
-
-    objs = spec.get("objects") or []
+    cells = spec.get("traversable_cells")
+    if isinstance(cells, (list, tuple)):
+        for cell in cells:
+            idx = _pair_index(cell, cols, rows)
+            if idx >= 0:
+                add_open(idx)
+
+    # Single pass over objects: each contributes blocked and/or open flat indices
+    objs = spec.get("objects")
+    if not isinstance(objs, (list, tuple)):
+        objs = ()
     for o in objs:
-        try:
+        if not isinstance(o, dict):
+            continue
+        gc = o.get("grid_cell")
+        idx = -1
+        if isinstance(gc, dict):
+            col = gc.get("col")
+            row = gc.get("row")
+            if isinstance(col, int) and isinstance(row, int):
+                if 0 <= col < cols and 0 <= row < rows:
+                    idx = row * cols + col
+
+        if idx >= 0:
             # Force-blocked cells
-            props = o.get("properties") or {}
-            if bool(props.get("blocked", False)):
-                gc = o.get("grid_cell")
-                if isinstance(gc, dict):
-                    col = gc.get("col")
-                    row = gc.get("row")
-                    if isinstance(col, int) and isinstance(row, int):
-                        if 0 <= col < cols and 0 <= row < rows:
-                            blocked.add((col, row))
+            props = o.get("properties")
+            if isinstance(props, dict) and props.get("blocked", False):
+                add_blocked(idx)
 
             # Doors: force-open the door cell
-            if str(o.get("type", "")).lower() == "door":
-                gc = o.get("grid_cell", {}) or {}
-                col = gc.get("col")
-                row = gc.get("row")
-                if isinstance(col, int) and isinstance(row, int):
-                    if 0 <= col < cols and 0 <= row < rows:
-                        forced_open.add((col, row))
-
-            # Object-level explicit traversable cells
-            for cell in o.get("traversable_cells", []) or []:
-                if isinstance(cell, (list, tuple)) and len(cell) == 2:
-                    c, r = int(cell[0]), int(cell[1])
-                    if 0 <= c < cols and 0 <= r < rows:
-                        forced_open.add((c, r))
-
-            # Object-level walkable area (rectangular)
-            wa = o.get("walkable_area")
-            if isinstance(wa, dict):
-                if str(wa.get("type", "")).lower() == "rectangle":
-                    b = wa.get("bounds", {}) or {}
-                    min_col = int(b.get("min_col", 0))
-                    max_col = int(b.get("max_col", 0))
-                    min_row = int(b.get("min_row", 0))
-                    max_row = int(b.get("max_row", 0))
-                    for c in range(min_col, max_col):
-                        for r in range(min_row, max_row):
-                            if 0 <= c < cols and 0 <= r < rows:
-                                forced_open.add((c, r))
-        except Exception:
-            continue
+            if _is_kind(o.get("type"), "door"):
+                add_open(idx)
+
+        # Object-level explicit traversable cells
+        cells = o.get("traversable_cells")
+        if isinstance(cells, (list, tuple)):
+            for cell in cells:
+                cell_idx = _pair_index(cell, cols, rows)
+                if cell_idx >= 0:
+                    add_open(cell_idx)
+
+        # Object-level walkable area (rectangular)
+        wa = o.get("walkable_area")
+        if isinstance(wa, dict) and _is_kind(wa.get("type"), "rectangle"):
+            b = wa.get("bounds")
+            if not isinstance(b, dict):
+                b = {}
+            try:
+                min_col = int(b.get("min_col", 0))
+                max_col = int(b.get("max_col", 0))
+                min_row = int(b.get("min_row", 0))
+                max_row = int(b.get("max_row", 0))
+            except (TypeError, ValueError, OverflowError):
+                continue
+            rect_open |= _rect_bits(cols, rows, min_col, max_col, min_row, max_row)
 
     # Ensure explicit traversable cells are not blocked
-    blocked.difference_update(forced_open)
-    return blocked
+    size = cols * rows
+    forced_open = _bits_from_indices(size, open_idx) | rect_open
+    return _bits_from_indices(size, block_idx) & ~forced_open
 
 
 def _default_start_goal(spec: dict, cols: int, rows: int) -> tuple[tuple[int, int], tuple[int, int]]:
@@ -246,8 +445,14 @@ def is_spec_traversable(
         except Exception:
             pass
 
-    ok, plen = check_traversable(cols, rows, blocked, s, g, min_len=min_len)
-    info = {"cols": cols, "rows": rows, "start": s, "goal": g, "blocked_count": len(blocked)}
+    plen = None
+    if _in_bounds(s[0], s[1], cols, rows) and _in_bounds(g[0], g[1], cols, rows):
+        if not blocked:
+            plen = abs(s[0] - g[0]) + abs(s[1] - g[1])
+        else:
+            plen = _grid_path_length(cols, rows, _mask_from_bits(cols, rows, blocked), s, g)
+    ok, plen = _check_length(plen, min_len)
+    info = {"cols": cols, "rows": rows, "start": s, "goal": g, "blocked_count": blocked.bit_count()}
     return ok, plen, info
 
 
@@ -4,11 +4,22 @@
 from __future__ import annotations
 
 import ast
+import importlib
 import logging
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from operator import attrgetter
+from types import CodeType
+from typing import Any
+
+# Optional: pyahocorasick for a single-pass forbidden-token scan (falls back to per-token search)
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
-ALLOWED_IMPORTS: set[str] = {"bpy", "math", "mathutils"}
+ALLOWED_IMPORTS: frozenset[str] = frozenset({"bpy", "math", "mathutils"})
 
 
 class CodeValidationError(Exception):
@@ -17,7 +28,8 @@ class CodeValidationError(Exception):
 
 
 # Conservative defaults for MVP. Can be expanded in Phase 3.
-FORBIDDEN_IMPORTS: set[str] = {
+# Policy sets are frozen so the visitor can bind them once (see _SafeCodeVisitor.visit_*).
+FORBIDDEN_IMPORTS: frozenset[str] = frozenset({
     "os",
     "sys",
     "subprocess",
@@ -27,15 +39,15 @@ FORBIDDEN_IMPORTS: set[str] = {
     "ctypes",
     "multiprocessing",
     "threading",
-}
-FORBIDDEN_CALLS: set[str] = {
+})
+FORBIDDEN_CALLS: frozenset[str] = frozenset({
     "open",
     "exec",
     "eval",
     "compile",
     "__import__",
     "input",
-}
+})
 # Quick token scan to short-circuit obviously unsafe code.
 # Special-case: direct open(...) should be caught here to produce a clear "forbidden token" message,
 # but "with open(...)" should be handled by AST to report precise with-statement context.
@@ -63,7 +75,7 @@ FORBIDDEN_TOKENS: Iterable[str] = (
 # bpy.ops security policy:
 # Allow only conservative operator namespaces used to build scenes.
 # Explicitly forbid namespaces that can write to disk, render, or otherwise cause side effects.
-ALLOWED_BPY_OPS_PREFIXES: set[str] = {
+ALLOWED_BPY_OPS_PREFIXES: frozenset[str] = frozenset({
     "object",
     "mesh",
     "camera",
@@ -71,9 +83,9 @@ ALLOWED_BPY_OPS_PREFIXES: set[str] = {
     "transform",
     "curve",
     "collection",
-}
+})
 
-FORBIDDEN_BPY_OPS_PREFIXES: set[str] = {
+FORBIDDEN_BPY_OPS_PREFIXES: frozenset[str] = frozenset({
     "wm",
     "render",
     "image",
@@ -86,20 +98,65 @@ FORBIDDEN_BPY_OPS_PREFIXES: set[str] = {
     "screen",
     "window",
     "preferences",
-}
+})
+
+# Precomputed lookup tables for _SafeCodeVisitor (one membership test per check)
+_BPY_OPS_ALLOWED: frozenset[str] = ALLOWED_BPY_OPS_PREFIXES - FORBIDDEN_BPY_OPS_PREFIXES
+_BPY_APP_HANDLERS = ["bpy", "app", "handlers"]
+_SHELL_MODULES = frozenset({"os", "subprocess"})
+_SHELL_CALLS = frozenset(
+    {"system", "popen", "run", "call", "popen3", "popen2", "popen4", "check_call", "check_output"}
+)
+
+
+def _build_token_automaton() -> object | None:
+    """Aho-Corasick automaton over FORBIDDEN_TOKENS; values carry (priority, token)."""
+    if ahocorasick is None:
+        return None
+    try:
+        automaton = ahocorasick.Automaton()
+        for priority, token in enumerate(FORBIDDEN_TOKENS):
+            automaton.add_word(token, (priority, token))
+        automaton.make_automaton()
+        return automaton
+    except Exception as ex:
+        logger.debug("Token automaton build failed: %s", ex)
+        return None
+
+
+_TOKEN_AUTOMATON: Any = _build_token_automaton()  # ahocorasick.Automaton or None (untyped extension)
+_FORBIDDEN_TOKEN_BYTES: tuple[tuple[bytes, str], ...] = tuple(
+    (t.encode("ascii"), t) for t in FORBIDDEN_TOKENS
+)
 
 
 def quick_token_scan(code: str) -> str | None:
     """
     Cheap substring-based scan to catch blatant unsafe usage early.
-    Returns the first offending token found, or None if clean.
+    Returns the first offending token found (in FORBIDDEN_TOKENS order), or None if clean.
+    Uses one Aho-Corasick pass when pyahocorasick is available.
     """
+    # One normalization for both paths, so the verdict doesn't depend on pyahocorasick
     lowered = code.lower()
-    for forbidden_token in FORBIDDEN_TOKENS:
+    if _TOKEN_AUTOMATON is not None:
         # Allow AST to handle "with open(...)" for better error context; only flag direct open(...)
-        if forbidden_token == "open(" and "with open(" in lowered:
+        skip_open = "with open(" in lowered
+        first: tuple[int, str] | None = None
+        for _, hit in _TOKEN_AUTOMATON.iter(lowered):
+            if skip_open and hit[1] == "open(":
+                continue
+            if first is None or hit[0] < first[0]:
+                first = hit
+        return first[1] if first is not None else None
+
+    # Tokens are ASCII: search one byte copy of the lowered text (1 byte/char even when the code
+    # has non-ASCII text; the AST pass stays authoritative for anything the scan misses).
+    buf = lowered.encode("ascii", "replace")
+    skip_open = b"with open(" in buf
+    for token_bytes, forbidden_token in _FORBIDDEN_TOKEN_BYTES:
+        if skip_open and forbidden_token == "open(":
             continue
-        if forbidden_token in lowered:
+        if token_bytes in buf:
             return forbidden_token
     return None
 
@@ -107,12 +164,32 @@ def quick_token_scan(code: str) -> str | None:
 class _SafeCodeVisitor(ast.NodeVisitor):
     """
     AST visitor to detect disallowed imports and calls, including guarded bpy.ops usage.
+    visit() walks the tree with an explicit stack and a type -> handler table (_VISIT_DISPATCH);
+    the visit_* handlers only check their node and never recurse themselves.
     """
 
     def __init__(self) -> None:
         super().__init__()
         self.errors: list[str] = []
 
+    def visit(self, node: ast.AST) -> None:
+        dispatch = _VISIT_DISPATCH
+        leaves = _LEAF_NODE_TYPES
+        iter_children = ast.iter_child_nodes
+        stack = [node]
+        pop = stack.pop
+        push = stack.extend
+        while stack:
+            cur = pop()
+            handler = dispatch.get(type(cur))
+            if handler is not None:
+                handler(self, cur)
+            children = [child for child in iter_children(cur) if type(child) not in leaves]
+            if children:
+                # Reverse so siblings pop in source order (errors stay in pre-order)
+                children.reverse()
+                push(children)
+
     def _add_error(self, msg: str, node: ast.AST | None = None) -> None:
         loc = ""
         if node is not None and hasattr(node, "lineno"):
@@ -126,86 +203,103 @@ class _SafeCodeVisitor(ast.NodeVisitor):
         chain: list[str] = []
         cur = node
         while isinstance(cur, ast.Attribute):
-            chain.insert(0, cur.attr or "")
+            chain.append(cur.attr)
             cur = cur.value
         if isinstance(cur, ast.Name):
-            chain.insert(0, cur.id or "")
+            chain.append(cur.id)
+        chain.reverse()
         return chain
 
     # Import validations
-    def visit_Import(self, node: ast.Import) -> None:
+    # Policy sets are bound as defaults so lookups are locals, not globals
+    def visit_Import(
+        self,
+        node: ast.Import,
+        _forbidden: frozenset[str] = FORBIDDEN_IMPORTS,
+        _allowed: frozenset[str] = ALLOWED_IMPORTS,
+    ) -> None:
         for alias in node.names:
             mod = (alias.name or "").split(".")[0]
-            if mod in FORBIDDEN_IMPORTS:
+            if mod in _forbidden:
                 self._add_error(f"Forbidden import: {alias.name}", node)
-            elif mod not in ALLOWED_IMPORTS:
+            elif mod not in _allowed:
                 self._add_error(f"Import not allowed: {alias.name}", node)
-        self.generic_visit(node)
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+    def visit_ImportFrom(
+        self,
+        node: ast.ImportFrom,
+        _forbidden: frozenset[str] = FORBIDDEN_IMPORTS,
+        _allowed: frozenset[str] = ALLOWED_IMPORTS,
+    ) -> None:
         mod = (node.module or "").split(".")[0] if node.module else ""
-        if mod in FORBIDDEN_IMPORTS:
+        if mod in _forbidden:
             self._add_error(f"Forbidden import from: {node.module}", node)
-        elif mod and mod not in ALLOWED_IMPORTS:
+        elif mod and mod not in _allowed:
             self._add_error(f"Import from not allowed: {node.module}", node)
-        self.generic_visit(node)
 
     # Call validations (names, attributes, bpy.ops, bpy.app.handlers)
-    def visit_Call(self, node: ast.Call) -> None:
+    def visit_Call(
+        self,
+        node: ast.Call,
+        _forbidden_calls: frozenset[str] = FORBIDDEN_CALLS,
+        _shell_modules: frozenset[str] = _SHELL_MODULES,
+        _shell_calls: frozenset[str] = _SHELL_CALLS,
+        _ops_allowed: frozenset[str] = _BPY_OPS_ALLOWED,
+    ) -> None:
+        func = node.func
         # Direct function name e.g. open(), eval(), exec()
-        if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-            if func_name in FORBIDDEN_CALLS:
-                self._add_error(f"Forbidden call: {func_name}()", node)
+        if isinstance(func, ast.Name):
+            if func.id in _forbidden_calls:
+                self._add_error(f"Forbidden call: {func.id}()", node)
+            return
 
         # Attribute calls e.g. os.system(), subprocess.Popen()
-        if isinstance(node.func, ast.Attribute):
-            attr = node.func.attr
-            base = node.func.value
-            base_name = base.id if isinstance(base, ast.Name) else ""
-            if base_name in {"os", "subprocess"} and attr.lower() in {
-                "system", "popen", "run", "call", "popen3", "popen2", "popen4", "check_call", "check_output"
-            }:
-                self._add_error(f"Forbidden call: {base_name}.{attr}()", node)
-
-        # Guard bpy.ops.* namespace via allow/deny lists
-        chain = self._get_attr_chain(node.func)
-        if len(chain) >= 3 and chain[0] == "bpy" and chain[1] == "ops":
-            prefix = chain[2]
-            full = ".".join(chain)
-            if prefix in FORBIDDEN_BPY_OPS_PREFIXES or prefix not in ALLOWED_BPY_OPS_PREFIXES:
-                self._add_error(f"Forbidden bpy.ops call: {full}()", node)
-
-        # Minimal protection against bpy.app.handlers usage (calls)
-        if len(chain) >= 3 and chain[0] == "bpy" and chain[1] == "app" and chain[2] == "handlers":
-            self._add_error("Use of bpy.app.handlers is not allowed", node)
-
-        self.generic_visit(node)
+        if isinstance(func, ast.Attribute):
+            base = func.value
+            if isinstance(base, ast.Name) and base.id in _shell_modules:
+                if func.attr.lower() in _shell_calls:
+                    self._add_error(f"Forbidden call: {base.id}.{func.attr}()", node)
+
+        # Attribute chain built inline (append + reverse) for bpy.ops / bpy.app.handlers checks
+        chain: list[str] = []
+        cur = func
+        while isinstance(cur, ast.Attribute):
+            chain.append(cur.attr)
+            cur = cur.value
+        if isinstance(cur, ast.Name):
+            chain.append(cur.id)
+        if len(chain) >= 3 and chain[-1] == "bpy":
+            chain.reverse()
+            if chain[1] == "ops":
+                # Guard bpy.ops.* namespace via the precomputed allow-minus-deny set
+                if chain[2] not in _ops_allowed:
+                    self._add_error(f"Forbidden bpy.ops call: {'.'.join(chain)}()", node)
+            elif chain[1] == "app" and chain[2] == "handlers":
+                # Minimal protection against bpy.app.handlers usage (calls)
+                self._add_error("Use of bpy.app.handlers is not allowed", node)
+
 
     # Assignments: block modifying bpy.app.handlers
     def visit_Assign(self, node: ast.Assign) -> None:
         for tgt in node.targets:
             if isinstance(tgt, ast.Attribute):
                 chain = self._get_attr_chain(tgt)
-                if len(chain) >= 3 and chain[0] == "bpy" and chain[1] == "app" and chain[2] == "handlers":
+                if chain[:3] == _BPY_APP_HANDLERS:
                     self._add_error("Modifying bpy.app.handlers is not allowed", node)
-        self.generic_visit(node)
 
     def visit_AugAssign(self, node: ast.AugAssign) -> None:
         tgt = node.target
         if isinstance(tgt, ast.Attribute):
             chain = self._get_attr_chain(tgt)
-            if len(chain) >= 3 and chain[0] == "bpy" and chain[1] == "app" and chain[2] == "handlers":
+            if chain[:3] == _BPY_APP_HANDLERS:
                 self._add_error("Modifying bpy.app.handlers is not allowed", node)
-        self.generic_visit(node)
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
         tgt = node.target
         if isinstance(tgt, ast.Attribute):
             chain = self._get_attr_chain(tgt)
-            if len(chain) >= 3 and chain[0] == "bpy" and chain[1] == "app" and chain[2] == "handlers":
+            if chain[:3] == _BPY_APP_HANDLERS:
                 self._add_error("Modifying bpy.app.handlers is not allowed", node)
-        self.generic_visit(node)
 
     # Optional: Prevent with open(...) patterns even if aliased
     def visit_With(self, node: ast.With) -> None:
@@ -215,7 +309,20 @@ class _SafeCodeVisitor(ast.NodeVisitor):
                 call = item.context_expr
                 if isinstance(call.func, ast.Name) and call.func.id == "open":
                     self._add_error("Forbidden use of open() in with-statement", node)
-        self.generic_visit(node)
+
+
+# Node type -> _SafeCodeVisitor handler; every other node type is only traversed
+_VISIT_DISPATCH: dict[type[ast.AST], Callable[..., None]] = {
+    ast.Import: _SafeCodeVisitor.visit_Import,
+    ast.ImportFrom: _SafeCodeVisitor.visit_ImportFrom,
+    ast.Call: _SafeCodeVisitor.visit_Call,
+    ast.Assign: _SafeCodeVisitor.visit_Assign,
+    ast.AugAssign: _SafeCodeVisitor.visit_AugAssign,
+    ast.AnnAssign: _SafeCodeVisitor.visit_AnnAssign,
+    ast.With: _SafeCodeVisitor.visit_With,
+}
+# Nodes that never contain anything the visitor checks; not pushed onto the walk stack
+_LEAF_NODE_TYPES = frozenset({ast.Load, ast.Store, ast.Del, ast.Constant})
 
 
 def validate_scene_code(code: str) -> None:
@@ -226,137 +333,200 @@ def validate_scene_code(code: str) -> None:
     if not isinstance(code, str) or not code.strip():
         raise CodeValidationError("Code is empty")
 
+    error = _scene_code_error(code)
+    if error is not None:
+        raise CodeValidationError(error)
+
+
+@lru_cache(maxsize=512)
+def _scene_code_error(code: str) -> str | None:
+    """
+    Return the violation message for code, or None when clean.
+    Only the verdict is cached (keyed by the code string itself, so no fingerprint
+    collisions), letting repeated validation of the same snippet skip the scan and parse.
+    """
+    return _check_scene_code(code)[1]
+
+
+def _check_scene_code(code: str) -> tuple[ast.AST | None, str | None]:
+    """Run the token scan and AST checks; return (parsed tree, None) or (None, violation message)."""
     found_token = quick_token_scan(code)
     if found_token:
         # Produce clearer, test-friendly messages for common cases, while keeping a fast path.
         if found_token.startswith("import "):
             mod = found_token.split(" ", 1)[1].strip()
-            raise CodeValidationError(f"Import not allowed: {mod}")
+            return None, f"Import not allowed: {mod}"
         if found_token.startswith("exec("):
-            raise CodeValidationError("Forbidden call: exec()")
+            return None, "Forbidden call: exec()"
         if found_token.startswith("eval("):
-            raise CodeValidationError("Forbidden call: eval()")
+            return None, "Forbidden call: eval()"
         if found_token.startswith("compile("):
-            raise CodeValidationError("Forbidden call: compile()")
+            return None, "Forbidden call: compile()"
         if found_token.startswith("input("):
-            raise CodeValidationError("Forbidden call: input()")
+            return None, "Forbidden call: input()"
         if found_token == "__import__":
-            raise CodeValidationError("Forbidden call: __import__()")
-        raise CodeValidationError(f"Code contains forbidden token: {found_token}")
+            return None, "Forbidden call: __import__()"
+        return None, f"Code contains forbidden token: {found_token}"
 
     try:
-        tree = ast.parse(code, filename="<canvas3d_generated>", mode="exec")
+        # Same flags the executor compiles with (dont_inherit, optimize=2), AST only
+        tree = compile(
+            code, "<canvas3d_generated>", "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True, optimize=2
+        )
     except SyntaxError as syn:
-        raise CodeValidationError(f"Syntax error: {syn}") from syn
+        return None, f"Syntax error: {syn}"
     except Exception as ex:
-        raise CodeValidationError(f"Parsing failed: {ex}") from ex
+        return None, f"Parsing failed: {ex}"
 
     visitor = _SafeCodeVisitor()
     visitor.visit(tree)
     if visitor.errors:
-        raise CodeValidationError("Unsafe code detected:\n- " + "\n- ".join(visitor.errors))
+        return None, "Unsafe code detected:\n- " + "\n- ".join(visitor.errors)
+    return tree, None
 
 
-def make_restricted_globals(bpy_module: object, allowed_imports: set[str] | None = None, extra_symbols: dict[str, object] | None = None) -> dict[str, object]:
+# Let callers (tests, probe runs after a policy change) drop cached verdicts
+validate_scene_code.cache_clear = _scene_code_error.cache_clear  # type: ignore[attr-defined]
+
+
+def validate_and_compile(code: str, filename: str = "<canvas3d_generated>") -> CodeType:
     """
-    Construct a constrained globals dict for exec():
-    - Restricts builtins to a safe, minimal set
-    - Provides a safe __import__ that allows only whitelisted modules
-    - Exposes bpy and explicitly allowed modules/symbols
+    Validate code and compile it for exec() from the already-parsed AST, so the source
+    is lexed and parsed once rather than once for validation and again for compile().
+    Raises CodeValidationError on violations; compile-stage errors propagate unchanged.
     """
-    import importlib
+    if not isinstance(code, str) or not code.strip():
+        raise CodeValidationError("Code is empty")
+
+    tree, error = _check_scene_code(code)
+    if not isinstance(tree, ast.Module):
+        # error is set whenever no tree came back; compile() needs the Module itself
+        raise CodeValidationError(error or "Parsing failed: expected a module")
+    return compile(tree, filename, "exec", dont_inherit=True, optimize=2)
 
-    allowed = set(allowed_imports or ALLOWED_IMPORTS)
 
-    # Pre-resolve allowed modules to ensure availability without exposing general import
-    resolved = {}
-    for name in allowed:
+@lru_cache(maxsize=8)
+def _resolve_allowed(allowed: frozenset[str]) -> dict[str, object]:
+    """Import each allowlisted module once per allowlist (bpy is injected separately as a proxy)."""
+    resolved: dict[str, object] = {}
+    for name in sorted(allowed):
         if name == "bpy":
-            # defer injection; we'll wrap with a proxy below
+            # defer injection; make_restricted_globals wraps it with a proxy
             continue
         try:
             resolved[name] = importlib.import_module(name)
         except Exception as ex:
             # Module may not exist in environment (e.g., mathutils outside Blender); skip silently
             logger.debug(f"Optional allowed module not available: {name} ({ex})")
+    return resolved
+
+
+# Runtime guard: proxy for bpy.ops that enforces ALLOWED_BPY_OPS_PREFIXES/FORBIDDEN_BPY_OPS_PREFIXES
+class _OpsProxy:
+    def __init__(
+        self,
+        real_ops: object,
+        path: tuple[str, ...] = (),
+        resolved_cache: dict[tuple[str, ...], Callable[..., object]] | None = None,
+    ) -> None:
+        self._real_ops = real_ops
+        self._path = tuple(path)
+        # Shared by the root proxy and every child: validated op path -> real callable
+        self._resolved_cache = {} if resolved_cache is None else resolved_cache
+
+    def __getattr__(self, name: str) -> _OpsProxy:
+        # accumulate attribute chain segments (e.g., object, camera_add)
+        return _OpsProxy(self._real_ops, self._path + (name,), self._resolved_cache)
+
+    def __call__(self, *args: object, **kwargs: object) -> object:
+        fn = self._resolved_cache.get(self._path)
+        if fn is None:
+            # First call for this op id: validate the prefix, resolve on real bpy.ops, cache
+            parts = list(self._path)
+            op_id = "bpy.ops." + ".".join(parts) if parts else "bpy.ops"
+            if not parts:
+                raise RuntimeError(f"Invalid operator call: {op_id}")
+            if parts[0] not in _BPY_OPS_ALLOWED:
+                raise RuntimeError(f"Forbidden bpy.ops call blocked by Canvas3D sandbox: {op_id}()")
+            fn = self._resolved_cache[self._path] = attrgetter(".".join(parts))(self._real_ops)
+        return fn(*args, **kwargs)
+
+
+class _BpyProxy:
+    """Expose bpy with guarded ops; pass-through for other attributes."""
+    def __init__(self, real_bpy: object) -> None:
+        self._real_bpy = real_bpy
+        self.ops = _OpsProxy(real_bpy.ops) if hasattr(real_bpy, "ops") else None
+
+    def __getattr__(self, name: str) -> object:
+        # Prefer explicit ops proxy; otherwise delegate attribute to real bpy
+        if name == "ops":
+            return self.ops
+        return getattr(self._real_bpy, name)
+
+
+# Safe builtins (harmless utilities only; no eval/exec/compile/open/input).
+# __import__ is added per allowlist; make_restricted_globals copies this per call so one
+# exec cannot leak builtins changes into the next.
+_SAFE_BUILTINS: dict[str, object] = {
+    "range": range,
+    "len": len,
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "sum": sum,
+    "enumerate": enumerate,
+    "zip": zip,
+    "sorted": sorted,
+    "any": any,
+    "all": all,
+    # additional harmless builtins to reduce false negatives
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "round": round,
+    "list": list,
+    "dict": dict,
+    "tuple": tuple,
+    "set": set,
+    # Common exception classes to allow generated code to raise/handle errors safely
+    "BaseException": BaseException,
+    "Exception": Exception,
+    "RuntimeError": RuntimeError,
+    "ValueError": ValueError,
+    "TypeError": TypeError,
+    "NameError": NameError,
+    "KeyError": KeyError,
+    "IndexError": IndexError,
+    "AssertionError": AssertionError,
+}
+
 
+@lru_cache(maxsize=8)
+def _safe_importer(allowed: frozenset[str]) -> Callable[..., object]:
+    """Build the sandbox __import__ for an allowlist once; it holds no per-call state."""
     def _safe_import(name: str, globals: dict | None = None, locals: dict | None = None, fromlist: tuple[str, ...] = (), level: int = 0) -> object:
         base = (name or "").split(".")[0]
         if base in allowed:
             return importlib.import_module(name)
         raise ImportError(f"Import of '{name}' is not allowed by Canvas3D sandbox")
 
-    # Runtime guard: proxy for bpy.ops that enforces ALLOWED_BPY_OPS_PREFIXES/FORBIDDEN_BPY_OPS_PREFIXES
-    class _OpsProxy:
-        def __init__(self, real_ops: object, path: tuple[str, ...] = ()) -> None:
-            self._real_ops = real_ops
-            self._path = tuple(path)
+    return _safe_import
 
-        def __getattr__(self, name: str) -> _OpsProxy:
-            # accumulate attribute chain segments (e.g., object, camera_add)
-            return _OpsProxy(self._real_ops, self._path + (name,))
 
-        def __call__(self, *args: object, **kwargs: object) -> object:
-            # Validate fully qualified op id before dispatch
-            parts = list(self._path)
-            op_id = "bpy.ops." + ".".join(parts) if parts else "bpy.ops"
-            if not parts:
-                raise RuntimeError(f"Invalid operator call: {op_id}")
-            prefix = parts[0]
-            if prefix in FORBIDDEN_BPY_OPS_PREFIXES or prefix not in ALLOWED_BPY_OPS_PREFIXES:
-                raise RuntimeError(f"Forbidden bpy.ops call blocked by Canvas3D sandbox: {op_id}()")
-            # Resolve callable on real bpy.ops and execute
-            target = self._real_ops
-            for seg in parts:
-                target = getattr(target, seg)
-            return target(*args, **kwargs)
-
-    class _BpyProxy:
-        """Expose bpy with guarded ops; pass-through for other attributes."""
-        def __init__(self, real_bpy: object) -> None:
-            self._real_bpy = real_bpy
-            self.ops = _OpsProxy(real_bpy.ops) if hasattr(real_bpy, "ops") else None
-
-        def __getattr__(self, name: str) -> object:
-            # Prefer explicit ops proxy; otherwise delegate attribute to real bpy
-            if name == "ops":
-                return self.ops
-            return getattr(self._real_bpy, name)
-
-    # Safe builtins (harmless utilities only; no eval/exec/compile/open/input)
-    safe_builtins = {
-        "__import__": _safe_import,
-        "range": range,
-        "len": len,
-        "min": min,
-        "max": max,
-        "abs": abs,
-        "sum": sum,
-        "enumerate": enumerate,
-        "zip": zip,
-        "sorted": sorted,
-        "any": any,
-        "all": all,
-        # additional harmless builtins to reduce false negatives
-        "int": int,
-        "float": float,
-        "bool": bool,
-        "round": round,
-        "list": list,
-        "dict": dict,
-        "tuple": tuple,
-        "set": set,
-        # Common exception classes to allow generated code to raise/handle errors safely
-        "BaseException": BaseException,
-        "Exception": Exception,
-        "RuntimeError": RuntimeError,
-        "ValueError": ValueError,
-        "TypeError": TypeError,
-        "NameError": NameError,
-        "KeyError": KeyError,
-        "IndexError": IndexError,
-        "AssertionError": AssertionError,
-    }
+def make_restricted_globals(bpy_module: object, allowed_imports: set[str] | None = None, extra_symbols: dict[str, object] | None = None) -> dict[str, object]:
+    """
+    Construct a constrained globals dict for exec():
+    - Restricts builtins to a safe, minimal set
+    - Provides a safe __import__ that allows only whitelisted modules
+    - Exposes bpy and explicitly allowed modules/symbols
+    """
+    allowed = frozenset(allowed_imports or ALLOWED_IMPORTS)
+
+    # Fresh builtins dict per call from the module-level table; proxy classes and the
+    # allowlist importer are built once instead of per call
+    safe_builtins = dict(_SAFE_BUILTINS)
+    safe_builtins["__import__"] = _safe_importer(allowed)
 
     sandbox_globals = {
         "__builtins__": safe_builtins,
@@ -367,8 +537,9 @@ def make_restricted_globals(bpy_module: object, allowed_imports: set[str] | None
     if bpy_module is not None:
         sandbox_globals["bpy"] = _BpyProxy(bpy_module)
 
-    # Inject other allowed, pre-resolved modules (math, mathutils, etc.)
-    sandbox_globals.update(resolved)
+    # Inject other allowed modules, pre-resolved once per allowlist (math, mathutils, etc.);
+    # update() copies the entries so the cached mapping itself is never exposed
+    sandbox_globals.update(_resolve_allowed(allowed))
 
     if extra_symbols:
         sandbox_globals.update(extra_symbols)
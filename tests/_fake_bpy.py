@@ -0,0 +1,189 @@
+"""
+Shared minimal bpy stub for executor/builder cleanup tests.
+
+Provides data-block managers (objects, materials, images, meshes, collections, worlds)
+and a tiny ops namespace (object.camera_add). Instances are pooled by the fixtures in
+conftest.py; _FakeBpy.reset() empties every manager in place between tests.
+"""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+__all__ = ["Snapshot", "_FakeBpy", "_FakeObject", "_NamedBlock", "patched_bpy", "snapshot"]
+
+
+class _NamedBlock:
+    __slots__ = ("_name", "_owner")
+
+    def __init__(self, name):
+        self._name = name
+        self._owner = None  # manager holding this block; re-keyed on rename like bpy.data
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._owner is not None:
+            self._owner._rename(self._name, value)
+        self._name = value
+
+
+class _FakeObject(_NamedBlock):
+    __slots__ = ()
+
+    @property
+    def name_full(self):
+        # Blender uses name_full for unique identifier in objects diff (== name for local data)
+        return self._name
+
+
+class _ManagerBase:
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        self._items = {}
+
+    def __iter__(self):
+        # Iterate values like Blender's bpy.data.collections
+        return iter(self._items.values())
+
+    def get(self, name):
+        return self._items.get(name)
+
+    def _add(self, name, obj):
+        self._items[name] = obj
+        obj._owner = self
+
+    def _rename(self, old, new):
+        if old in self._items:
+            self._items[new] = self._items.pop(old)
+
+    def _remove_by_name(self, name):
+        obj = self._items.pop(name, None)
+        if obj is not None:
+            obj._owner = None
+
+    def _reset(self):
+        self._items.clear()
+
+    def remove(self, item, do_unlink=True):  # do_unlink is accepted to mirror Blender API
+        # Most bpy.data.remove signatures accept data-block object; we simulate lookup by its .name/.name_full
+        name = getattr(item, "name", None) or getattr(item, "name_full", None)
+        if not isinstance(name, str):
+            raise TypeError("Invalid data-block passed to remove()")
+        self._remove_by_name(name)
+
+
+class _ObjectsManager(_ManagerBase):
+    __slots__ = ()
+
+    def new(self, name, *args, **kwargs):
+        obj = _FakeObject(name)
+        self._add(name, obj)
+        return obj
+
+
+class _MaterialsManager(_ManagerBase):
+    __slots__ = ()
+
+    def new(self, name):
+        m = _NamedBlock(name)
+        self._add(name, m)
+        return m
+
+
+class _ImagesManager(_ManagerBase):
+    __slots__ = ()
+
+
+class _MeshesManager(_ManagerBase):
+    __slots__ = ()
+
+    def new(self, name):
+        m = _NamedBlock(name)
+        self._add(name, m)
+        return m
+
+
+class _CollectionsManager(_ManagerBase):
+    __slots__ = ()
+
+    def new(self, name):
+        c = _NamedBlock(name)
+        self._add(name, c)
+        return c
+
+
+class _WorldsManager(_ManagerBase):
+    __slots__ = ()
+
+
+@dataclass(slots=True)
+class _DataContainer:
+    objects: _ObjectsManager = field(default_factory=_ObjectsManager)
+    materials: _MaterialsManager = field(default_factory=_MaterialsManager)
+    images: _ImagesManager = field(default_factory=_ImagesManager)
+    meshes: _MeshesManager = field(default_factory=_MeshesManager)
+    collections: _CollectionsManager = field(default_factory=_CollectionsManager)
+    worlds: _WorldsManager = field(default_factory=_WorldsManager)
+
+    def reset(self):
+        # Empty every manager in place so a pooled instance can be reused without rebuilding
+        for manager in (self.objects, self.materials, self.images, self.meshes, self.collections, self.worlds):
+            manager._reset()
+
+
+class _OpsObjectNS:
+    def __init__(self, data: _DataContainer):
+        self._data = data
+        self._i = 0
+
+    def camera_add(self, *args, **kwargs):
+        # Create a deterministic new object; nothing else in the fake uses the TmpObj prefix
+        self._i += 1
+        self._data.objects.new(f"TmpObj{self._i}")
+        return {"FINISHED"}
+
+
+class _OpsNS:
+    def __init__(self, data: _DataContainer):
+        self.object = _OpsObjectNS(data)
+        # Forbidden namespaces (wm, render, etc.) are not needed for these tests
+
+
+class _FakeBpy:
+    """
+    Minimal bpy stub with data-block managers and ops namespace.
+    """
+    def __init__(self):
+        self.data = _DataContainer()
+        self.ops = _OpsNS(self.data)
+
+    def reset(self):
+        # Restore the freshly-built state: empty managers and camera_add numbering from 1
+        self.data.reset()
+        self.ops.object._i = 0
+
+
+Snapshot = namedtuple("Snapshot", "objects materials images meshes collections worlds")
+
+
+def snapshot(bpy):
+    # Frozen name sets of every manager, taken in one call for post-execution assertions
+    d = bpy.data
+    managers = (d.objects, d.materials, d.images, d.meshes, d.collections, d.worlds)
+    return Snapshot(*(frozenset(m._items) for m in managers))
+
+
+@contextmanager
+def patched_bpy(module, fake):
+    # Swap module.bpy for the fake for the duration of the block (raises if the module has no bpy)
+    old = module.bpy
+    module.bpy = fake
+    try:
+        yield fake
+    finally:
+        module.bpy = old
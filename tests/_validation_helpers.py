@@ -0,0 +1,44 @@
+"""
+Issue lookups shared by the scene spec validation tests.
+
+index() collapses a validator result into a (path, code) set once per test so each
+assertion is a membership check instead of another pass over the issue list.
+run_validate() memoizes results per spec content, since most tests validate small
+variations of one template and several validate identical specs.
+"""
+
+import json
+
+from canvas3d.utils.spec_validation import validate_scene_spec
+
+_VALIDATE_CACHE = {}
+
+
+def run_validate(spec):
+    # Keyed on canonical JSON; issues are returned as a tuple so cached results stay immutable
+    key = json.dumps(spec, sort_keys=True)
+    hit = _VALIDATE_CACHE.get(key)
+    if hit is None:
+        ok, issues = validate_scene_spec(spec, expect_version="1.0.0")
+        hit = _VALIDATE_CACHE[key] = (ok, tuple(issues))
+    return hit
+
+
+def index(issues):
+    return {(i.path, i.code) for i in issues}
+
+
+def has(idx, path, code):
+    # code may be a single issue code or a collection of acceptable codes
+    if isinstance(code, str):
+        return (path, code) in idx
+    return any((path, c) in idx for c in code)
+
+
+def has_suffix(idx, suffix, code):
+    # For element paths whose index does not matter (e.g. "$.materials[0].pbr.roughness")
+    return any(c == code and p.endswith(suffix) for p, c in idx)
+
+
+def codes(idx):
+    return {c for _, c in idx}
@@ -0,0 +1,40 @@
+from collections import deque
+from functools import lru_cache
+
+import pytest
+
+from _fake_bpy import _FakeBpy
+from canvas3d.utils.traversability import astar_path_length
+
+_BPY_POOL_SIZE = 8
+
+
+@pytest.fixture(scope="session")
+def bpy_pool():
+    # Pre-built fake bpy instances reused across tests (see fake_bpy)
+    return deque(_FakeBpy() for _ in range(_BPY_POOL_SIZE))
+
+
+@pytest.fixture
+def fake_bpy(bpy_pool):
+    # Borrow a pooled instance with empty managers; build a fresh one if the pool is drained
+    bpy = bpy_pool.popleft() if bpy_pool else _FakeBpy()
+    bpy.reset()
+    yield bpy
+    bpy.reset()
+    bpy_pool.append(bpy)
+
+
+@lru_cache(maxsize=256)
+def _astar_cached(cols, rows, blocked_fs, start, goal):
+    return astar_path_length(cols, rows, set(blocked_fs), start, goal)
+
+
+def _astar(cols, rows, blocked, start, goal):
+    # Identical grids across tests share one search; blocked is frozen to make the key hashable
+    return _astar_cached(cols, rows, frozenset(blocked), start, goal)
+
+
+@pytest.fixture
+def astar():
+    return _astar
@@ -1,13 +1,17 @@
+import copy
+
 import pytest
 
 from canvas3d.utils.spec_validation import (
-    validate_scene_spec,
+    SceneSpecValidator,
     assert_valid_scene_spec,
     SpecValidationError,
 )
 
+from _validation_helpers import codes, has, has_suffix, index, run_validate
 
-def make_valid_spec():
+
+def _build_template():
     return {
         "version": "1.0.0",
         "domain": "procedural_dungeon",
@@ -86,15 +90,36 @@ def make_valid_spec():
     }
 
 
-def run_validate(spec):
-    ok, issues = validate_scene_spec(spec, expect_version="1.0.0")
-    return ok, issues
+# Built once at import; tests copy only what they mutate
+_TEMPLATE = _build_template()
+
+
+def make_valid_spec():
+    # Re-evaluating the literal is the cheapest fully independent copy
+    # (several times faster than copy.deepcopy or json.loads of a cached dump)
+    return _build_template()
+
+
+def spec_with(**overrides):
+    # Shallow copy for top-level scalar tweaks; nested branches stay shared with _TEMPLATE
+    return {**_TEMPLATE, **overrides}
+
+
+def spec_with_nested(path, value):
+    # Copy only the dicts/lists along path, then set the leaf
+    spec = dict(_TEMPLATE)
+    node = spec
+    for key in path[:-1]:
+        node[key] = copy.copy(node[key])
+        node = node[key]
+    node[path[-1]] = value
+    return spec
 
 
 def test_valid_spec_passes():
     ok, issues = run_validate(make_valid_spec())
     assert ok is True
-    assert issues == []
+    assert issues == ()
 
 
 @pytest.mark.parametrize("missing_field", ["version", "domain", "seed", "objects", "lighting", "camera"])
@@ -106,96 +131,153 @@ def test_missing_required_fields(missing_field):
     assert any(i.code == "required" and missing_field in i.message for i in issues)
 
 
+# (id, build invalid spec, expected issue path, accepted issue codes)
+SINGLE_FIELD_CASES = [
+    ("version-format", lambda: spec_with(version="1.0"), "$.version", {"format", "mismatch"}),
+    ("domain-enum", lambda: spec_with(domain="city"), "$.domain", {"enum"}),
+    ("units-enum", lambda: spec_with(units="centimeters"), "$.units", {"enum"}),
+    ("seed-negative", lambda: spec_with(seed=-1), "$.seed", {"minimum"}),
+    (
+        "grid-cell-size-range",
+        lambda: spec_with_nested(("grid", "cell_size_m"), 0.1),
+        "$.grid.cell_size_m",
+        {"range"},
+    ),
+    (
+        "grid-cell-col-type",
+        lambda: spec_with_nested(("objects", 0, "grid_cell"), {"col": "1", "row": 2}),
+        "$.objects[0].grid_cell.col",
+        {"type"},
+    ),
+    (
+        "corridor-direction-enum",
+        lambda: spec_with_nested(("objects", 1, "properties", "direction"), "up"),
+        "$.objects[1].properties.direction",
+        {"enum"},
+    ),
+    ("lighting-min-items", lambda: spec_with(lighting=[]), "$.lighting", {"minItems"}),
+    (
+        "camera-fov-range",
+        lambda: spec_with_nested(("camera", "fov_deg"), 10.0),
+        "$.camera.fov_deg",
+        {"range"},
+    ),
+    (
+        "camera-rotation-length",
+        lambda: spec_with_nested(("camera", "rotation_euler"), [0.0, 0.0]),
+        "$.camera.rotation_euler",
+        {"type"},
+    ),
+]
+
+
+@pytest.mark.parametrize("case", SINGLE_FIELD_CASES, ids=[c[0] for c in SINGLE_FIELD_CASES])
+def test_single_field_invalid(case):
+    _, build, expected_path, expected_codes = case
+    ok, issues = run_validate(build())
+    assert ok is False
+    assert has(index(issues), expected_path, expected_codes)
+
+
 def test_grid_missing_reports_required():
     spec = make_valid_spec()
     del spec["grid"]
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.grid" and i.code == "required" for i in issues)
+    assert has(idx, "$.grid", "required")
 
 
-def test_version_format_invalid():
-    spec = make_valid_spec()
-    spec["version"] = "1.0"
+def test_grid_dimensions_type_and_range():
+    spec = spec_with_nested(("grid", "dimensions"), {"cols": "10", "rows": 300})
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.version" and i.code in {"format", "mismatch"} for i in issues)
+    assert has(idx, "$.grid.dimensions.cols", "type")
+    assert has(idx, "$.grid.dimensions.rows", "range")
 
 
-def test_domain_invalid():
+def test_object_id_ascii_and_unique():
     spec = make_valid_spec()
-    spec["domain"] = "city"
+    # Non-ASCII ID
+    spec["objects"][0]["id"] = "room_α"
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.domain" and i.code == "enum" for i in issues)
+    assert has(idx, "$.objects[0].id", "ascii")
 
-
-def test_units_invalid():
+    # Duplicate IDs
     spec = make_valid_spec()
-    spec["units"] = "centimeters"
+    spec["objects"][1]["id"] = spec["objects"][0]["id"]
+    spec["objects"][2]["id"] = spec["objects"][0]["id"]
     ok, issues = run_validate(spec)
     assert ok is False
-    assert any(i.path == "$.units" and i.code == "enum" for i in issues)
+    # Reported once per section, not once per duplicate
+    assert sum(1 for i in issues if i.path == "$.objects" and i.code == "unique") == 1
 
 
-def test_seed_negative():
+def test_object_type_enum_and_transforms_types():
     spec = make_valid_spec()
-    spec["seed"] = -1
+    spec["objects"][0]["type"] = "sphere"
+    spec["objects"][0]["position"] = [0.0, 1.0]  # bad length
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.seed" and i.code == "minimum" for i in issues)
+    assert has(idx, "$.objects[0].type", "enum")
+    assert has(idx, "$.objects[0].position", "type")
 
 
-def test_grid_cell_size_out_of_range():
+def test_door_must_be_adjacent_to_room_or_corridor():
     spec = make_valid_spec()
-    spec["grid"]["cell_size_m"] = 0.1
+    spec["objects"][2]["grid_cell"] = {"col": 15, "row": 12}  # far from room/corridor
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.grid.cell_size_m" and i.code == "range" for i in issues)
+    assert has(idx, "$.objects[2]", "cross_constraint")
 
-
-def test_grid_dimensions_type_and_range():
     spec = make_valid_spec()
-    spec["grid"]["dimensions"]["cols"] = "10"
-    spec["grid"]["dimensions"]["rows"] = 300
+    spec["objects"][2]["grid_cell"] = {"col": 4, "row": 4}  # next to room_a
     ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path == "$.grid.dimensions.cols" and i.code == "type" for i in issues)
-    assert any(i.path == "$.grid.dimensions.rows" and i.code == "range" for i in issues)
+    assert ok is True
 
 
-def test_object_id_ascii_and_unique():
+@pytest.mark.parametrize("door_cell", [{"col": 3, "row": 0}, {"col": 3, "row": 65536}])
+def test_door_adjacency_with_out_of_grid_rows(door_cell):
+    # Negative/huge rows must not alias onto a neighbouring cell of another column
     spec = make_valid_spec()
-    # Non-ASCII ID
-    spec["objects"][0]["id"] = "room_α"
+    spec["objects"][0]["grid_cell"] = {"col": 2, "row": -1}
+    spec["objects"][2]["grid_cell"] = door_cell
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path.startswith("$.objects[0].id") and i.code == "ascii" for i in issues)
+    assert has(idx, "$.objects[2]", "cross_constraint")
 
-    # Duplicate IDs
+
+def test_cross_field_skipped_when_schema_issues_exceed_threshold():
     spec = make_valid_spec()
-    spec["objects"][1]["id"] = spec["objects"][0]["id"]
+    spec["objects"][2]["grid_cell"] = {"col": 15, "row": 12}  # misplaced door
+    spec["objects"].extend({"id": f"bad_{n}", "type": "sphere"} for n in range(150))
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.objects" and i.code == "unique" for i in issues)
+    assert len(issues) > 100
+    assert "cross_constraint" not in codes(idx)
 
 
-def test_object_type_enum_and_transforms_types():
+def test_cross_field_skipped_on_structural_issues_unless_disabled():
     spec = make_valid_spec()
-    spec["objects"][0]["type"] = "sphere"
-    spec["objects"][0]["position"] = [0.0, 1.0]  # bad length
-    ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path.startswith("$.objects[0].type") and i.code == "enum" for i in issues)
-    assert any(i.path.startswith("$.objects[0].position") and i.code == "type" for i in issues)
+    spec["objects"][2]["grid_cell"] = {"col": 15, "row": 12}  # misplaced door
+    spec["seed"] = "not-an-int"
+    validator = SceneSpecValidator(expect_version="1.0.0")
 
+    issues = validator.validate(spec)
+    idx = index(issues)
+    assert has(idx, "$.seed", "type")
+    assert "cross_constraint" not in codes(idx)
 
-def test_object_grid_cell_types():
-    spec = make_valid_spec()
-    spec["objects"][0]["grid_cell"] = {"col": "1", "row": 2}
-    ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path == "$.objects[0].grid_cell.col" and i.code == "type" for i in issues)
+    issues = validator.validate(spec, fail_fast=False)
+    idx = index(issues)
+    assert has(idx, "$.objects[2]", "cross_constraint")
 
 
 def test_material_names_unique_and_ranges():
@@ -203,17 +285,19 @@ def test_material_names_unique_and_ranges():
     # Duplicate material name
     spec["materials"][1]["name"] = spec["materials"][0]["name"]
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.materials" and i.code == "unique" for i in issues)
+    assert has(idx, "$.materials", "unique")
 
     # Out-of-range pbr values
     spec = make_valid_spec()
     spec["materials"][0]["pbr"]["base_color"] = [1.2, -0.1, 0.5]
     spec["materials"][0]["pbr"]["roughness"] = 1.5
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path.endswith(".pbr.base_color") and i.code == "range" for i in issues)
-    assert any(i.path.endswith(".pbr.roughness") and i.code == "range" for i in issues)
+    assert has_suffix(idx, ".pbr.base_color", "range")
+    assert has_suffix(idx, ".pbr.roughness", "range")
 
 
 def test_collections_ascii_unique_and_purpose_enum():
@@ -222,42 +306,24 @@ def test_collections_ascii_unique_and_purpose_enum():
     spec["collections"][1]["name"] = spec["collections"][0]["name"]  # duplicate
     spec["collections"][2]["purpose"] = "render"  # invalid enum
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
     # Name ascii + unique
-    assert any(i.code == "ascii" and i.path.endswith(".name") for i in issues)
-    assert any(i.code == "unique" and i.path == "$.collections" for i in issues)
+    assert has_suffix(idx, ".name", "ascii")
+    assert has(idx, "$.collections", "unique")
     # Purpose enum
-    assert any(i.code == "enum" and i.path.endswith(".purpose") for i in issues)
+    assert has_suffix(idx, ".purpose", "enum")
 
 
-def test_lighting_minitems_and_ranges():
-    spec = make_valid_spec()
-    spec["lighting"] = []
-    ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path == "$.lighting" and i.code == "minItems" for i in issues)
-
+def test_lighting_ranges():
     spec = make_valid_spec()
     spec["lighting"][0]["intensity"] = 20000.0
     spec["lighting"][1]["color_rgb"] = [-0.1, 0.0, 1.1]
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path.endswith(".intensity") and i.code == "range" for i in issues)
-    assert any(i.path.endswith(".color_rgb") and i.code == "range" for i in issues)
-
-
-def test_camera_fov_out_of_range_and_types():
-    spec = make_valid_spec()
-    spec["camera"]["fov_deg"] = 10.0
-    ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path == "$.camera.fov_deg" and i.code == "range" for i in issues)
-
-    spec = make_valid_spec()
-    spec["camera"]["rotation_euler"] = [0.0, 0.0]  # wrong length
-    ok, issues = run_validate(spec)
-    assert ok is False
-    assert any(i.path == "$.camera.rotation_euler" and i.code == "type" for i in issues)
+    assert has_suffix(idx, ".intensity", "range")
+    assert has_suffix(idx, ".color_rgb", "range")
 
 
 def test_constraints_checks():
@@ -266,15 +332,31 @@ def test_constraints_checks():
     spec["constraints"]["require_traversable_start_to_goal"] = "yes"
     spec["constraints"]["max_polycount"] = 500
     ok, issues = run_validate(spec)
+    idx = index(issues)
     assert ok is False
-    assert any(i.path == "$.constraints.min_path_length_cells" and i.code == "minimum" for i in issues)
-    assert any(i.path == "$.constraints.require_traversable_start_to_goal" and i.code == "type" for i in issues)
-    assert any(i.path == "$.constraints.max_polycount" and i.code == "minimum" for i in issues)
+    assert has(idx, "$.constraints.min_path_length_cells", "minimum")
+    assert has(idx, "$.constraints.require_traversable_start_to_goal", "type")
+    assert has(idx, "$.constraints.max_polycount", "minimum")
 
 
-def test_assert_valid_scene_spec_raises_with_issue_listing():
+def test_best_practice_hints_only_when_requested():
     spec = make_valid_spec()
-    spec["version"] = "1.0"  # invalid format
+    spec["grid"]["dimensions"] = {"cols": 5, "rows": 9}
+    spec["lighting"] = spec["lighting"][:1]
+    spec["camera"]["fov_deg"] = 110.0
+    ok, issues = run_validate(spec)
+    assert ok is True
+
+    issues = SceneSpecValidator(expect_version="1.0.0").validate(spec, collect_hints=True)
+    assert {(i.path, i.code) for i in issues} == {
+        ("$.grid.dimensions", "warning"),
+        ("$.lighting", "hint"),
+        ("$.camera.fov_deg", "hint"),
+    }
+
+
+def test_assert_valid_scene_spec_raises_with_issue_listing():
+    spec = spec_with(version="1.0")  # invalid format
     with pytest.raises(SpecValidationError) as exc:
         assert_valid_scene_spec(spec, expect_version="1.0.0")
     msg = str(exc.value)
@@ -1,3 +1,6 @@
+import random
+from collections import deque
+
 import pytest
 
 from canvas3d.utils.traversability import (
@@ -7,14 +10,14 @@ from canvas3d.utils.traversability import (
 )
 
 
-def test_astar_simple_path():
+def test_astar_simple_path(astar):
     cols, rows = 5, 4
     blocked = set()
     start = (0, 0)
     goal = (4, 3)
     # Manhattan shortest path length for 4-connected grid
     expected = (4 - 0) + (3 - 0)
-    length = astar_path_length(cols, rows, blocked, start, goal)
+    length = astar(cols, rows, blocked, start, goal)
     assert length == expected
 
 
@@ -27,6 +30,35 @@ def test_astar_no_path_due_to_blocked_barrier():
     assert astar_path_length(cols, rows, blocked, start, goal) is None
 
 
+def _bfs_path_length(cols, rows, blocked, start, goal):
+    if start in blocked or goal in blocked:
+        return None
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        c, r = queue.popleft()
+        if (c, r) == goal:
+            return dist[(c, r)]
+        for nb in ((c + 1, r), (c - 1, r), (c, r + 1), (c, r - 1)):
+            if 0 <= nb[0] < cols and 0 <= nb[1] < rows and nb not in blocked and nb not in dist:
+                dist[nb] = dist[(c, r)] + 1
+                queue.append(nb)
+    return None
+
+
+def test_astar_matches_bfs_on_random_grids():
+    # Covers both the small-grid A* and the bidirectional search used on larger grids
+    rng = random.Random(7)  # noqa: S311 - seeded, non-crypto fuzz input
+    for _ in range(300):
+        cols, rows = rng.randint(1, 20), rng.randint(1, 20)
+        n_blocked = rng.randint(0, cols * rows // 2)
+        blocked = {(rng.randrange(cols), rng.randrange(rows)) for _ in range(n_blocked)}
+        start = (rng.randrange(cols), rng.randrange(rows))
+        goal = (rng.randrange(cols), rng.randrange(rows))
+        expected = _bfs_path_length(cols, rows, blocked, start, goal)
+        assert astar_path_length(cols, rows, blocked, start, goal) == expected
+
+
 def test_check_traversable_min_length():
     cols, rows = 3, 3
     blocked = set()
@@ -113,4 +145,34 @@ def test_is_spec_traversable_blocked_start_or_goal():
     )
     ok2, plen2, _ = is_spec_traversable(spec, min_len=0)
     assert ok2 is False
-    assert plen2 is None
\ No newline at end of file
+    assert plen2 is None
+
+def test_is_spec_traversable_doors_and_walkable_area_open_blocked_cells():
+    spec = _make_min_spec()
+    rows = spec["grid"]["dimensions"]["rows"]
+    # Full wall at col=2 cuts the grid in two
+    for r in range(rows):
+        spec["objects"].append(
+            {"id": f"wall_{r}", "type": "wall", "grid_cell": {"col": 2, "row": r}, "properties": {"blocked": True}}
+        )
+    ok, plen, info = is_spec_traversable(spec, min_len=0)
+    assert ok is False and plen is None
+    assert info["blocked_count"] == rows
+
+    # A door in the wall re-opens its cell
+    door_spec = _make_min_spec()
+    door_spec["objects"] = list(spec["objects"]) + [
+        {"id": "door_a", "type": "door", "grid_cell": {"col": 2, "row": 2}, "properties": {"blocked": True}}
+    ]
+    ok, plen, info = is_spec_traversable(door_spec, min_len=0)
+    assert ok is True and plen == 9
+    assert info["blocked_count"] == rows - 1
+
+    # A walkable_area rectangle covering the bottom two wall cells re-opens them
+    spec["objects"][0]["walkable_area"] = {
+        "type": "rectangle",
+        "bounds": {"min_col": 2, "max_col": 3, "min_row": rows - 2, "max_row": rows + 3},
+    }
+    ok, plen, info = is_spec_traversable(spec, min_len=0)
+    assert ok is True and plen == 9
+    assert info["blocked_count"] == rows - 2
@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 import pytest
 
 from canvas3d.utils.validation import (
@@ -8,6 +10,8 @@ from canvas3d.utils.validation import (
 
 
 class _LeafCall:
+    __slots__ = ("_name", "_on_call")
+
     def __init__(self, name, on_call):
         self._name = name
         self._on_call = on_call
@@ -18,23 +22,6 @@ class _LeafCall:
         return "ok"
 
 
-class _Namespace:
-    def __init__(self, mapping=None):
-        self._mapping = mapping or {}
-
-    def __getattr__(self, name: str):
-        try:
-            return self._mapping[name]
-        except KeyError as ex:
-            raise AttributeError(name) from ex
-
-    def __setattr__(self, name: str, value):
-        if name == "_mapping":
-            super().__setattr__(name, value)
-        else:
-            self._mapping[name] = value
-
-
 class _FakeBpy:
     """
     Minimal fake bpy with an ops tree to exercise runtime guard.
@@ -45,16 +32,23 @@ class _FakeBpy:
         self._on_call = on_call or (lambda name, args, kwargs: self._calls.append((name, args, kwargs)))
 
         # Build ops namespace: bpy.ops.object.camera_add and bpy.ops.wm.save_mainfile
-        wm_ns = _Namespace({
-            "save_mainfile": _LeafCall("wm.save_mainfile", self._on_call)
-        })
-        object_ns = _Namespace({
-            "camera_add": _LeafCall("object.camera_add", self._on_call)
-        })
-        self.ops = _Namespace({
-            "wm": wm_ns,
-            "object": object_ns,
-        })
+        self.ops = SimpleNamespace(
+            wm=SimpleNamespace(save_mainfile=_LeafCall("wm.save_mainfile", self._on_call)),
+            object=SimpleNamespace(camera_add=_LeafCall("object.camera_add", self._on_call)),
+        )
+
+
+# Runtime snippets compiled once at import; filenames match the snippet names
+_CODE_SNIPPETS = {
+    "test_forbidden_op": "bpy.ops.wm.save_mainfile(filepath='x')",
+    "test_allowed_op": "bpy.ops.object.camera_add()",
+    "test_builtins": (
+        "x = int(3.7); y = round(3.2); z = sum([1,2,3]); a = bool(1); b = list((1,2)); c = dict([('k', 1)])"
+    ),
+    "test_repeated_op": "for i in range(3):\n    bpy.ops.object.camera_add(location=(i, 0, 0))",
+    "test_forbidden_repeat": "bpy.ops.wm.save_mainfile()",
+}
+_COMPILED = {name: compile(src, f"<{name}>", "exec") for name, src in _CODE_SNIPPETS.items()}
 
 
 # -----------------------------
@@ -105,9 +99,8 @@ def test_runtime_ops_proxy_blocks_forbidden_wm_save_mainfile():
     safe_globals = make_restricted_globals(fake_bpy, allowed_imports={"bpy"}, extra_symbols=None)
 
     # Execute code referencing bpy injected into globals (no import)
-    code = "bpy.ops.wm.save_mainfile(filepath='x')"
     with pytest.raises(RuntimeError) as e:
-        exec(compile(code, "<test_forbidden_op>", "exec"), safe_globals, {})
+        exec(_COMPILED["test_forbidden_op"], safe_globals, {})
     assert "Forbidden bpy.ops call blocked by Canvas3D sandbox" in str(e.value)
     # Ensure the underlying callable was never reached
     assert called["hit"] is False
@@ -122,9 +115,8 @@ def test_runtime_ops_proxy_allows_allowed_object_camera_add():
     fake_bpy = _FakeBpy(on_call=on_call)
     safe_globals = make_restricted_globals(fake_bpy, allowed_imports={"bpy"}, extra_symbols=None)
 
-    code = "bpy.ops.object.camera_add()"
     # Should not raise; should call through to fake op
-    exec(compile(code, "<test_allowed_op>", "exec"), safe_globals, {})
+    exec(_COMPILED["test_allowed_op"], safe_globals, {})
     assert any(n == "object.camera_add" for n, _, _ in calls)
 
 
@@ -132,11 +124,24 @@ def test_runtime_safe_builtins_available_without_bpy():
     # No bpy needed to exercise safe builtins
     safe_globals = make_restricted_globals(bpy_module=None, allowed_imports=set(), extra_symbols=None)
     local_ns = {}
-    code = "x = int(3.7); y = round(3.2); z = sum([1,2,3]); a = bool(1); b = list((1,2)); c = dict([('k', 1)])"
-    exec(compile(code, "<test_builtins>", "exec"), safe_globals, local_ns)
+    exec(_COMPILED["test_builtins"], safe_globals, local_ns)
     assert local_ns["x"] == 3
     assert local_ns["y"] == 3
     assert local_ns["z"] == 6
     assert local_ns["a"] is True
     assert local_ns["b"] == [1, 2]
-    assert local_ns["c"] == {"k": 1}
\ No newline at end of file
+    assert local_ns["c"] == {"k": 1}
+
+def test_runtime_ops_proxy_repeated_calls_dispatch_and_stay_guarded():
+    calls = []
+    fake_bpy = _FakeBpy(on_call=lambda name, args, kwargs: calls.append((name, args, kwargs)))
+    safe_globals = make_restricted_globals(fake_bpy, allowed_imports={"bpy"}, extra_symbols=None)
+
+    # Resolved ops are cached after the first call; every call must still reach the real op
+    exec(_COMPILED["test_repeated_op"], safe_globals, {})
+    assert [kwargs["location"][0] for _, _, kwargs in calls] == [0, 1, 2]
+
+    # Forbidden ops are never cached and keep raising
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            exec(_COMPILED["test_forbidden_repeat"], safe_globals, {})
@@ -6,6 +6,7 @@ Purpose:
 - Make real HTTP calls to Anthropic (scene spec) and optionally OpenAI (code generation) via LLMInterface
 - Run 20+ prompts end-to-end to validate JSON extraction, retries, and error handling
 - Produce a JSON report with success rate, timings, errors, and minimal spec summaries
+  (results are listed in completion order; each entry carries its prompt "index")
 
 Requirements:
 - Set API keys via Blender add-on preferences or environment/config as documented.
@@ -16,6 +17,7 @@ Requirements:
 
 Usage:
   python tools/e2e_llm_probe.py --count 1 --timeout 30 --save_report
+  python tools/e2e_llm_probe.py --workers 4 --save_report
   python tools/e2e_llm_probe.py --provider anthropic --only anthropic --save_report
 """
 from __future__ import annotations
@@ -25,19 +27,22 @@ import json
 import os
 import sys
 import time
-import datetime
-from typing import List, Dict, Any
+import functools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, BinaryIO, List, Dict, Any, Optional, Tuple
 
-# Import within repo context
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Import within repo context. The canvas3d modules themselves are imported lazily where they
+# are used, so --help (and importing this file) doesn't load the LLM/requests stack.
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from canvas3d.core.llm_interface import (  # noqa: E402
-    LLMInterface,
-    ProviderError,
-    RateLimitError,
-    TimeoutError as ProviderTimeoutError,
-)
-from canvas3d.utils.blender_helpers import get_config_dir  # noqa: E402
+if TYPE_CHECKING:
+    from canvas3d.core.llm_interface import LLMInterface
 
 
 DEFAULT_PROMPTS: List[str] = [
@@ -67,127 +72,303 @@ DEFAULT_PROMPTS: List[str] = [
     "Japanese garden with stone path, pond, and lantern",
 ]
 
+# Concurrent in-flight prompts (bounded further by provider rate limits)
+DEFAULT_WORKERS = 8
+# Per-prompt retries after a RateLimitError, sleeping min(30, 2**attempt) seconds between tries
+_RATE_LIMIT_RETRIES = 3
+
+def _dumps(obj: object) -> bytes:
+    """Indented JSON as UTF-8 bytes; orjson when installed (much faster), else the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def _summarize_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
-    out: Dict[str, Any] = {}
-    try:
-        out["version"] = spec.get("version")
-        out["domain"] = spec.get("domain")
-        out["units"] = spec.get("units")
-        out["seed"] = spec.get("seed")
-        out["num_objects"] = len(spec.get("objects", []) or [])
-        out["num_lights"] = len(spec.get("lighting", []) or [])
-        out["has_camera"] = bool(spec.get("camera"))
-        if isinstance(spec.get("grid"), dict):
-            dims = (spec["grid"].get("dimensions") or {})
-            out["grid"] = {
-                "cell_size_m": spec["grid"].get("cell_size_m"),
-                "cols": dims.get("cols"),
-                "rows": dims.get("rows"),
-            }
-    except Exception:
-        pass
+    if not isinstance(spec, dict):
+        return {}
+    g = spec.get
+    objects = g("objects")
+    lights = g("lighting")
+    out: Dict[str, Any] = {
+        "version": g("version"),
+        "domain": g("domain"),
+        "units": g("units"),
+        "seed": g("seed"),
+        "num_objects": len(objects) if isinstance(objects, list) else 0,
+        "num_lights": len(lights) if isinstance(lights, list) else 0,
+        "has_camera": bool(g("camera")),
+    }
+    grid = g("grid")
+    if isinstance(grid, dict):
+        dims = grid.get("dimensions")
+        if not isinstance(dims, dict):
+            dims = {}
+        out["grid"] = {
+            "cell_size_m": grid.get("cell_size_m"),
+            "cols": dims.get("cols"),
+            "rows": dims.get("rows"),
+        }
     return out
 
-def run_probe(prompts: List[str], per_prompt_timeout: float, save_report: bool, count: int) -> Dict[str, Any]:
-    llm = LLMInterface()
-    # Ensure real calls
-    if llm.mock_mode:
-        print("Mock/Demo mode is enabled. Disable it to perform real HTTP calls.", file=sys.stderr)
-        return {"error": "mock_mode_enabled"}
+@functools.lru_cache(maxsize=1)
+def _get_llm() -> LLMInterface:
+    # One interface (and its pooled HTTP session) per process, reused by repeated run_probe calls
+    from canvas3d.core.llm_interface import LLMInterface
 
-    results: List[Dict[str, Any]] = []
-    t0 = time.perf_counter()
-    successes = 0
-    failures = 0
+    return LLMInterface()
 
-    # Optionally adjust timeout globally
-    try:
-        if per_prompt_timeout and per_prompt_timeout > 0:
-            llm.timeout_sec = float(per_prompt_timeout)
-    except Exception:
-        pass
-
-    for i, prompt in enumerate(prompts):
-        entry: Dict[str, Any] = {
-            "index": i,
-            "prompt": prompt,
-            "t_start": time.time(),
-        }
-        t_start = time.perf_counter()
+
+@dataclass(slots=True)
+class ProbeEntry:
+    """One prompt's outcome; fields left as None are omitted from the report."""
+    index: int
+    prompt: str
+    t_start: Optional[float] = None
+    ok: bool = False
+    summary: Optional[Dict[str, Any]] = None
+    raw_captured: Optional[bool] = None
+    raw_excerpt: Optional[str] = None
+    error_type: Optional[str] = None
+    error: Optional[str] = None
+    duration_sec: Optional[float] = None
+    t_end: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Report shape: only the keys that apply to this outcome (no deep copy like asdict)
+        return {name: value for name in _ENTRY_FIELDS if (value := getattr(self, name)) is not None}
+
+
+_ENTRY_FIELDS = tuple(f.name for f in fields(ProbeEntry))
+
+
+def _first_line(ex: BaseException) -> str:
+    return (str(ex).splitlines() or [""])[0]
+
+
+def _run_one(
+    llm: LLMInterface,
+    i: int,
+    prompt: str,
+    clock_base: Tuple[float, int],
+    cap: Optional[float],
+    started_ns: List[Optional[int]],
+) -> ProbeEntry:
+    """
+    Run a single prompt and return its report entry (worker body for run_probe).
+    clock_base is (wall seconds, perf_counter_ns) sampled once per probe; entry wall times are
+    derived from the monotonic clock so each entry reads the clock only twice.
+    The start time is published in started_ns[i] so run_probe can measure the cap from the moment
+    the prompt actually started; the remaining budget is passed on as the HTTP timeout.
+    """
+    from canvas3d.core.llm_interface import ProviderError, ProviderTimeoutError, RateLimitError
+
+    base_wall, base_ns = clock_base
+    t_start = time.perf_counter_ns()
+    started_ns[i] = t_start
+    deadline = t_start + int(cap * 1e9) if cap else None
+    entry = ProbeEntry(index=i, prompt=prompt, t_start=base_wall + (t_start - base_ns) / 1e9)
+    attempt = 0
+    while True:
+        left = None if deadline is None else max(0.001, (deadline - time.perf_counter_ns()) / 1e9)
         try:
             # Keep tokens conservative by using single spec (not bundle) for e2e validation
-            spec = llm.get_scene_spec(prompt, request_id=f"probe-{i}")
-            dur = time.perf_counter() - t_start
-            entry["duration_sec"] = round(dur, 3)
-            entry["ok"] = True
-            entry["summary"] = _summarize_spec(spec)
+            spec = llm.get_scene_spec(prompt, request_id=f"probe-{i}", timeout_sec=left)
+            t_done = time.perf_counter_ns()
+            entry.ok = True
+            entry.summary = _summarize_spec(spec)
             # Capture raw last text if available (method may not exist in some builds)
             try:
-                entry["raw_captured"] = True
-                entry["raw_excerpt"] = (llm.get_last_raw() or "")[:1000]
+                entry.raw_captured = True
+                entry.raw_excerpt = llm.get_last_raw(max_chars=1000)
             except Exception:
-                entry["raw_captured"] = False
-            successes += 1
+                entry.raw_captured = False
         except RateLimitError as e:
-            dur = time.perf_counter() - t_start
-            entry["duration_sec"] = round(dur, 3)
-            entry["ok"] = False
-            entry["error_type"] = "RateLimitError"
-            entry["error"] = str(e).splitlines()[0]
-            failures += 1
+            delay = min(30, 2 ** attempt)
+            if attempt < _RATE_LIMIT_RETRIES and (
+                deadline is None or time.perf_counter_ns() + int(delay * 1e9) < deadline
+            ):
+                # Back off this worker only; the rest of the batch keeps going
+                time.sleep(delay)
+                attempt += 1
+                continue
+            t_done = time.perf_counter_ns()
+            entry.error_type = "RateLimitError"
+            entry.error = _first_line(e)
         except ProviderTimeoutError as e:
-            dur = time.perf_counter() - t_start
-            entry["duration_sec"] = round(dur, 3)
-            entry["ok"] = False
-            entry["error_type"] = "Timeout"
-            entry["error"] = str(e).splitlines()[0]
-            failures += 1
+            t_done = time.perf_counter_ns()
+            entry.error_type = "Timeout"
+            entry.error = _first_line(e)
         except ProviderError as e:
-            dur = time.perf_counter() - t_start
-            entry["duration_sec"] = round(dur, 3)
-            entry["ok"] = False
-            entry["error_type"] = "ProviderError"
-            entry["error"] = str(e).splitlines()[0]
-            failures += 1
+            t_done = time.perf_counter_ns()
+            entry.error_type = "ProviderError"
+            entry.error = _first_line(e)
         except Exception as e:
-            dur = time.perf_counter() - t_start
-            entry["duration_sec"] = round(dur, 3)
-            entry["ok"] = False
-            entry["error_type"] = "Unexpected"
-            entry["error"] = str(e).splitlines()[0]
-            failures += 1
+            t_done = time.perf_counter_ns()
+            entry.error_type = "Unexpected"
+            entry.error = _first_line(e)
+        break
 
-        entry["t_end"] = time.time()
-        results.append(entry)
-
-    total_dur = time.perf_counter() - t0
-    success_rate = (successes / max(1, len(prompts))) * 100.0
-
-    report: Dict[str, Any] = {
-        "ts": time.time(),
-        "ts_iso": datetime.datetime.utcnow().isoformat() + "Z",
-        "total_prompts": len(prompts),
-        "successes": successes,
-        "failures": failures,
-        "success_rate_pct": round(success_rate, 2),
-        "total_duration_sec": round(total_dur, 3),
-        "per_prompt_timeout_sec": per_prompt_timeout,
-        "acceptance_met": success_rate >= 80.0,
-        "results": results,
-    }
+    entry.duration_sec = round((t_done - t_start) / 1e9, 3)
+    entry.t_end = base_wall + (t_done - base_ns) / 1e9
+    return entry
+
+
+def _open_report_stream() -> BinaryIO | None:
+    """Open a new report file under the config dir with the results array started; None on failure."""
+    from canvas3d.utils.blender_helpers import get_config_dir
+
+    try:
+        out_dir = os.path.join(get_config_dir(), "reports")
+        os.makedirs(out_dir, exist_ok=True)
+        ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        out = open(os.path.join(out_dir, f"e2e_llm_probe_{ts}.json"), "wb")
+        out.write(b'{\n"results": [\n')
+        return out
+    except Exception as ex:
+        print(f"Warning: failed to save report: {ex}", file=sys.stderr)
+        return None
+
+
+def run_probe(  # noqa: C901
+    prompts: List[str],
+    per_prompt_timeout: float,
+    save_report: bool,
+    count: int,
+    workers: int = DEFAULT_WORKERS,
+) -> Dict[str, Any]:
+    llm = _get_llm()
+    # Ensure real calls
+    if llm.mock_mode:
+        print("Mock/Demo mode is enabled. Disable it to perform real HTTP calls.", file=sys.stderr)
+        return {"error": "mock_mode_enabled"}
 
-    if save_report:
+    clock_base = (time.time(), time.perf_counter_ns())
+
+    # With --save_report, entries are streamed into the report file as they are collected instead
+    # of being held in memory; the summary fields close the same JSON object at the end (or an
+    # "aborted" summary if the run is interrupted, so the file is always valid JSON). Either way
+    # results are in completion order.
+    out = _open_report_stream() if save_report else None
+    results: List[ProbeEntry] | None = [] if out is None else None
+    successes = 0
+    failures = 0
+    written = 0
+    finished = False
+
+    def collect(entry: ProbeEntry) -> None:
+        nonlocal successes, failures, written
+        if entry.ok:
+            successes += 1
+        else:
+            failures += 1
+        if out is not None:
+            out.write((b"" if written == 0 else b",\n") + _dumps(entry.to_dict()))
+            out.flush()
+        else:
+            results.append(entry)
+        written += 1
+
+    try:
+        # Prompts are independent and I/O-bound: fan out over a thread pool sharing one LLMInterface.
+        # per_prompt_timeout is the HTTP timeout of each call and also a hard cap measured from when
+        # the prompt started, so a socket hanging past its own timeout can't stall the run; prompts
+        # still queued behind a busy worker are not charged for the wait.
+        cap = per_prompt_timeout if per_prompt_timeout and per_prompt_timeout > 0 else None
+        cap_ns = int(cap * 1e9) if cap else None
+        n_workers = max(1, min(workers, len(prompts)))
+        started_ns: List[Optional[int]] = [None] * len(prompts)
+        pool = ThreadPoolExecutor(max_workers=n_workers)
         try:
-            cfg_dir = get_config_dir()
-            out_dir = os.path.join(cfg_dir, "reports")
-            os.makedirs(out_dir, exist_ok=True)
-            ts = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            out_fp = os.path.join(out_dir, f"e2e_llm_probe_{ts}.json")
-            with open(out_fp, "w", encoding="utf-8") as f:
-                json.dump(report, f, indent=2)
-            print(f"Saved report: {out_fp}")
-        except Exception as ex:
-            print(f"Warning: failed to save report: {ex}", file=sys.stderr)
+            index_of: Dict[Future, int] = {
+                pool.submit(_run_one, llm, i, prompt, clock_base, cap, started_ns): i
+                for i, prompt in enumerate(prompts)
+            }
+            pending = set(index_of)
+            # Whole-run bound: every prompt using its full cap, plus one round of grace for calls
+            # that overran theirs. Only reached if a call ignores its HTTP timeout.
+            run_deadline = (
+                clock_base[1] + cap_ns * (-(-len(prompts) // n_workers) + 1) if cap_ns is not None else None
+            )
+            while pending:
+                wait_sec = cap
+                if cap_ns is not None:
+                    now = time.perf_counter_ns()
+                    overrun = now >= run_deadline
+                    for fut in list(pending):
+                        i = index_of[fut]
+                        t0 = started_ns[i]
+                        if fut.done() or (t0 is None and not overrun):
+                            continue
+                        left_ns = min(t0 + cap_ns, run_deadline) - now if t0 is not None else 0
+                        if left_ns > 0:
+                            wait_sec = min(wait_sec, left_ns / 1e9)
+                            continue
+                        pending.discard(fut)
+                        if t0 is None:
+                            fut.cancel()
+                            collect(ProbeEntry(
+                                index=i,
+                                prompt=prompts[i],
+                                error_type="Timeout",
+                                error="Not started before the run deadline",
+                            ))
+                            continue
+                        collect(ProbeEntry(
+                            index=i,
+                            prompt=prompts[i],
+                            t_start=clock_base[0] + (t0 - clock_base[1]) / 1e9,
+                            error_type="Timeout",
+                            error=f"No result within {cap}s",
+                            duration_sec=round(min(now - t0, cap_ns) / 1e9, 3),
+                        ))
+                    if not pending:
+                        break
+                done, _ = wait(pending, timeout=wait_sec, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.discard(fut)
+                    collect(fut.result())
+        finally:
+            # Don't block on calls that blew the cap
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        total_dur = (time.perf_counter_ns() - clock_base[1]) / 1e9
+        success_rate = (successes / max(1, len(prompts))) * 100.0
+
+        report_ts = time.time()
+        report: Dict[str, Any] = {
+            "ts": report_ts,
+            "ts_iso": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(report_ts)),
+            "total_prompts": len(prompts),
+            "successes": successes,
+            "failures": failures,
+            "success_rate_pct": round(success_rate, 2),
+            "total_duration_sec": round(total_dur, 3),
+            "per_prompt_timeout_sec": per_prompt_timeout,
+            "acceptance_met": success_rate >= 80.0,
+        }
+        if out is not None:
+            # Close the results array and append the summary keys to the same object
+            out.write(b"\n],\n" + _dumps(report)[2:])
+            finished = True
+            report["report_path"] = out.name
+            print(f"Saved report: {out.name}")
+        else:
+            report["results"] = [entry.to_dict() for entry in results]
+    finally:
+        if out is not None:
+            if not finished:
+                try:
+                    aborted = {
+                        "aborted": True,
+                        "total_prompts": len(prompts),
+                        "successes": successes,
+                        "failures": failures,
+                    }
+                    out.write(b"\n],\n" + _dumps(aborted)[2:])
+                except Exception as ex:
+                    print(f"Warning: failed to close aborted report: {ex}", file=sys.stderr)
+            out.close()
 
     print(f"Completed {len(prompts)} prompts. Success rate: {report['success_rate_pct']}% "
           f"({'PASS' if report['acceptance_met'] else 'FAIL'}). Total duration: {report['total_duration_sec']}s")
@@ -197,26 +378,37 @@ def run_probe(prompts: List[str], per_prompt_timeout: float, save_report: bool,
 def main():
     ap = argparse.ArgumentParser(description="Canvas3D LLM E2E Probe")
     ap.add_argument("--count", type=int, default=1, help="Variants per prompt when applicable (not used in single spec)")
-    ap.add_argument("--timeout", type=float, default=30.0, help="Per-prompt network timeout in seconds")
+    ap.add_argument("--timeout", type=float, default=30.0, help="Per-prompt network timeout and wall-clock cap in seconds")
     ap.add_argument("--save_report", action="store_true", help="Save a JSON report under the Canvas3D config directory")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Prompts to run concurrently")
     ap.add_argument("--prompts_file", type=str, default="", help="Optional path to a JSON file with prompts array")
     args = ap.parse_args()
 
     prompts = DEFAULT_PROMPTS
     if args.prompts_file:
         try:
-            with open(args.prompts_file, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-            if isinstance(raw, list) and all(isinstance(x, str) for x in raw):
+            with open(args.prompts_file, "rb") as f:
+                data = f.read()
+            raw = orjson.loads(data) if orjson is not None else json.loads(data)
+            if isinstance(raw, list) and raw and all(isinstance(x, str) for x in raw):
                 prompts = raw
         except Exception as ex:
             print(f"Warning: failed to load prompts_file: {ex}", file=sys.stderr)
 
-    # Ensure at least 20 prompts for acceptance criteria
+    # Ensure at least 20 distinct prompts for acceptance criteria; literal repeats would only
+    # spend network calls and tokens on requests already made, so pad with numbered variants
+    prompts = list(dict.fromkeys(prompts))
     if len(prompts) < 20:
-        prompts = (prompts * ((20 + len(prompts) - 1) // len(prompts)))[:20]
+        n = len(prompts)
+        prompts += [f"{prompts[k % n]} (variant {k // n + 2})" for k in range(20 - n)]
 
-    run_probe(prompts=prompts, per_prompt_timeout=args.timeout, save_report=args.save_report, count=args.count)
+    run_probe(
+        prompts=prompts,
+        per_prompt_timeout=args.timeout,
+        save_report=args.save_report,
+        count=args.count,
+        workers=args.workers,
+    )
 
 
 if __name__ == "__main__":